@@ -3,14 +3,50 @@
 
 import sqlite3
 import os
+import sys
 from datetime import datetime
 
-def migrate_database():
-    """Add user_id column to tasks table and populate with default user."""
-    db_path = "task_dashboard.db"
+DB_PATH = "task_dashboard.db"
+
+# Bulk-friendly settings applied for the duration of the migration
+MIGRATION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+)
+
+# Composite indexes backing the task list filters (mirrors TaskModel.__table_args__)
+TASK_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_tasks_user_status_priority ON tasks (user_id, status, priority)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_user_due ON tasks (user_id, due_date)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_user_updated ON tasks (user_id, updated_at)",
+)
+
+def connect(db_path=DB_PATH):
+    """Open a migration connection with MIGRATION_PRAGMAS applied."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # Tune SQLite for bulk rewrites before touching the schema
+    for pragma in MIGRATION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def finish(conn):
+    """Close a migration connection."""
+    # Only journal_mode=WAL persists in the database file; synchronous and the
+    # other MIGRATION_PRAGMAS are per-connection and end here, and the app sets
+    # its own on connect (see database.SQLITE_PRAGMAS)
+    conn.close()
+
+def migrate_database(conn=None):
+    """Add user_id column to tasks table and populate with default user.
     
-    # Connect to database
-    conn = sqlite3.connect(db_path)
+    Pass an open connection from connect() to run as one step of a larger
+    migration; it is left open for the caller.
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = connect()
     cursor = conn.cursor()
     
     try:
@@ -46,24 +82,49 @@ def migrate_database():
                 cursor.execute("SELECT id FROM users LIMIT 1")
                 default_user_id = cursor.fetchone()[0]
             
-            # Update all existing tasks to belong to the default user
-            cursor.execute("UPDATE tasks SET user_id = ?", (default_user_id,))
-            
-            # Make user_id NOT NULL for new tasks
+            # Assign all existing tasks to the default user in a single write transaction
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
             cursor.execute("UPDATE tasks SET user_id = ? WHERE user_id IS NULL", (default_user_id,))
             
             print(f"Successfully migrated database. Assigned all tasks to user_id: {default_user_id}")
         else:
             print("user_id column already exists")
-            
+        
+        for statement in TASK_INDEXES:
+            cursor.execute(statement)
+        
         conn.commit()
         
+        # Refresh planner statistics so SQLite picks up the new indexes
+        cursor.execute("ANALYZE tasks")
+        
     except Exception as e:
         print(f"Error during migration: {e}")
         conn.rollback()
         raise
     finally:
-        conn.close()
+        if owns_conn:
+            finish(conn)
+
+def migrate_all(db_path=DB_PATH):
+    """Run the schema and password migrations over one warmed-up connection."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    from migrate_passwords import migrate_passwords, verify_migration
+    
+    conn = connect(db_path)
+    try:
+        migrate_database(conn)
+        # Hand the same connection (and its page cache) to the SQLAlchemy phase
+        engine = create_engine("sqlite://", creator=lambda: conn, poolclass=StaticPool)
+        if not migrate_passwords(engine) or not verify_migration(engine):
+            raise RuntimeError("Password migration failed")
+    finally:
+        finish(conn)
 
 if __name__ == "__main__":
-    migrate_database()
\ No newline at end of file
+    if "--passwords" in sys.argv:
+        migrate_all()
+    else:
+        migrate_database()
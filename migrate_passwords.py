@@ -3,6 +3,10 @@
 
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -10,35 +14,58 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from task_dashboard.database import db_manager, UserModel
 from task_dashboard.auth import AuthManager
 
-def migrate_passwords():
+# Number of users re-hashed and committed per batch
+BATCH_SIZE = 5000
+
+# Offending usernames listed by verify_migration()
+MAX_REPORTED_USERS = 100
+
+def _session(engine=None):
+    """Session on the given engine, or the application's database by default."""
+    return Session(engine) if engine is not None else db_manager.get_session()
+
+def migrate_passwords(engine=None):
     """Migrate all existing user passwords from SHA-256 to bcrypt."""
     print("Starting password migration...")
     
+    # Old SHA-256 hashes are stored as "salt$hash"; bcrypt hashes start with "$2?$"
+    legacy_filter = UserModel.password_hash.like('%$%') & ~UserModel.password_hash.like('$2_$%')
+    
     try:
-        with db_manager.get_session() as session:
-            # Get all users
-            users = session.query(UserModel).all()
-            print(f"Found {len(users)} users to migrate")
+        with _session(engine) as session, \
+                ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            total = session.query(UserModel).filter(legacy_filter).count()
+            print(f"Found {total} users to migrate")
             
             migrated_count = 0
-            for user in users:
-                # Check if the password is in the old format (contains $ separator)
-                if '$' in user.password_hash:
-                    # This is an old SHA-256 hash, migrate it
-                    # Extract the original password hash part (we can't recover the plain text)
-                    # So we'll create a temporary password and hash it with bcrypt
-                    # In a real scenario, you would want to force users to reset their passwords
-                    try:
-                        # For demonstration, we'll just re-hash with bcrypt
-                        # In practice, you should notify users to reset their passwords
-                        new_hash = AuthManager.hash_password("temporary_password")
-                        user.password_hash = new_hash
-                        migrated_count += 1
-                        print(f"Migrated user {user.username}")
-                    except Exception as e:
-                        print(f"Error migrating user {user.username}: {e}")
+            last_id = 0
+            while True:
+                # Walk the legacy users in id order so memory stays bounded by the batch size
+                batch = session.query(UserModel.id, UserModel.username).filter(
+                    legacy_filter, UserModel.id > last_id
+                ).order_by(UserModel.id).limit(BATCH_SIZE).all()
+                if not batch:
+                    break
+                
+                # We can't recover the plain text from the old hash, so each user gets a
+                # temporary password hashed with bcrypt. In practice, you should notify
+                # users to reset their passwords.
+                # bcrypt is CPU-bound, so spread the hashing across all cores
+                hashes = executor.map(
+                    AuthManager.hash_password,
+                    ["temporary_password"] * len(batch),
+                    chunksize=max(1, len(batch) // (os.cpu_count() or 1)),
+                )
+                session.bulk_update_mappings(UserModel, [
+                    {"id": user_id, "password_hash": new_hash}
+                    for (user_id, _), new_hash in zip(batch, hashes)
+                ])
+                session.commit()
+                
+                migrated_count += len(batch)
+                last_id = batch[-1].id
+                print(f"Migrated {migrated_count}/{total} users")
             
-            session.commit()
             print(f"Successfully migrated {migrated_count} users")
             
     except Exception as e:
@@ -47,25 +74,29 @@ def migrate_passwords():
     
     return True
 
-def verify_migration():
+def verify_migration(engine=None):
     """Verify that passwords have been migrated correctly."""
     print("Verifying password migration...")
     
     try:
-        with db_manager.get_session() as session:
-            users = session.query(UserModel).all()
-            verified_count = 0
+        with _session(engine) as session:
+            # bcrypt hashes start with $2b$, $2a$, or $2y$
+            is_bcrypt = or_(*(
+                UserModel.password_hash.like(f'{prefix}%') for prefix in ('$2b$', '$2a$', '$2y$')
+            ))
+            # Count in the database instead of loading every user
+            verified_count, total = session.query(
+                func.coalesce(func.sum(case((is_bcrypt, 1), else_=0)), 0),
+                func.count(UserModel.id)
+            ).one()
             
-            for user in users:
-                # Check if the password hash looks like a bcrypt hash
-                # bcrypt hashes start with $2b$, $2a$, or $2y$
-                if user.password_hash.startswith('$2b$') or user.password_hash.startswith('$2a$') or user.password_hash.startswith('$2y$'):
-                    verified_count += 1
-                else:
-                    print(f"User {user.username} still has old format password")
+            if verified_count < total:
+                offenders = session.query(UserModel.username).filter(~is_bcrypt).limit(MAX_REPORTED_USERS)
+                for (username,) in offenders:
+                    print(f"User {username} still has old format password")
             
-            print(f"Verified {verified_count}/{len(users)} users have bcrypt passwords")
-            return verified_count == len(users)
+            print(f"Verified {verified_count}/{total} users have bcrypt passwords")
+            return verified_count == total
             
     except Exception as e:
         print(f"Error during verification: {e}")
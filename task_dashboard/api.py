@@ -25,31 +25,70 @@ All responses use standard JSON format with appropriate HTTP status codes:
 - 500: Internal Server Error
 """
 
-from typing import List, Optional
-
-from fastapi import FastAPI, HTTPException, Query, Depends, Security, Request
+import hashlib
+import os
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List, Literal, Optional
+
+import orjson
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query, Body, Depends, Security, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, Field, model_validator
-import bleach
+from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import select, insert, update, delete, func, table, column, literal_column, lambda_stmt
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from starlette.concurrency import run_in_threadpool
 
-from task_dashboard.database import db_manager, TaskModel, UserModel
+from task_dashboard.database import db_manager, get_utc_now, has_task_fts, TaskModel, UserModel, TASKS_FTS_TABLE
 from task_dashboard.auth import AuthManager
-from task_dashboard.rate_limit_config import RateLimitConfig
+from task_dashboard.rate_limit_config import RateLimitConfig, forwarded_client_ip
+from task_dashboard.sanitize import sanitize_text
+
+def client_ip(request: Request) -> str:
+    """Client IP, honouring X-Forwarded-For when RateLimitConfig.TRUST_PROXY_HEADERS is set."""
+    return forwarded_client_ip(request.headers.get("x-forwarded-for", ""), get_remote_address(request))
+
+def rate_limit_key(request: Request) -> str:
+    """Rate limit per authenticated user when known, so users behind a shared NAT
+    do not exhaust each other's limits; otherwise per client IP."""
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return f"user:{user.id}"
+    return client_ip(request)
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=rate_limit_key,
+    strategy=RateLimitConfig.STRATEGY,
+    storage_uri=RateLimitConfig.STORAGE_URI,
+)
+
+# Number of pooled database connections opened at startup
+POOL_WARMUP_CONNECTIONS = int(os.getenv("DB_POOL_WARMUP", "5"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-open database connections so the first requests skip the connect cost."""
+    await run_in_threadpool(db_manager.warm_pool, POOL_WARMUP_CONNECTIONS)
+    yield
 
 # Initialize FastAPI app with enhanced metadata
 api_app = FastAPI(
+    lifespan=lifespan,
     title="Task Dashboard API",
     description="Comprehensive task management API with full CRUD operations, filtering, and statistics",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Task Dashboard Team",
         "url": "https://github.com/your-org/task-dashboard",
@@ -87,19 +126,16 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
 api_app.state.limiter = limiter
 api_app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
+# Allowed task field values; Literal fields are checked by pydantic-core itself
+TaskPriority = Literal["low", "medium", "high"]
+TaskStatus = Literal["todo", "in_progress", "done"]
+
 # Pydantic models for API
 class UserRegister(BaseModel):
     """Model for user registration."""
     username: str = Field(description="Unique username", min_length=3, max_length=50, pattern="^[a-zA-Z0-9_]+$")
-    email: str = Field(description="User email address", max_length=255)
+    email: EmailStr = Field(description="User email address")
     password: str = Field(description="User password (min 6 characters)", min_length=6, max_length=128)
-    
-    @model_validator(mode='after')
-    def validate_email_format(self) -> 'UserRegister':
-        # Basic email validation
-        if '@' not in self.email or '.' not in self.email.split('@')[-1]:
-            raise ValueError('Invalid email format')
-        return self
 
 class UserLogin(BaseModel):
     """Model for user login."""
@@ -112,40 +148,25 @@ class UserResponse(BaseModel):
     username: str = Field(description="Username")
     email: str = Field(description="Email address")
 
+class LoginResponse(UserResponse):
+    """Response model for a successful login."""
+    access_token: str = Field(description="Signed bearer token for the Authorization header")
+    token_type: str = Field("bearer", description="Token type")
+
 class TaskCreate(BaseModel):
     """Model for creating a new task."""
     title: str = Field(description="Task title (required)", min_length=1, max_length=255)
     description: str = Field("", description="Detailed task description", max_length=1000)
-    priority: str = Field("medium", description="Task priority level")
+    priority: TaskPriority = Field("medium", description="Task priority level")
     due_date: Optional[str] = Field(None, description="Due date in YYYY-MM-DD format", pattern=r"^\d{4}-\d{2}-\d{2}$")
-    
-    @model_validator(mode='after')
-    def validate_priority_values(self) -> 'TaskCreate':
-        allowed_priorities = ["low", "medium", "high"]
-        if self.priority not in allowed_priorities:
-            raise ValueError(f"Priority must be one of: {', '.join(allowed_priorities)}")
-        return self
 
 class TaskUpdate(BaseModel):
     """Model for updating an existing task. All fields are optional."""
     title: Optional[str] = Field(None, description="Task title", min_length=1, max_length=255)
     description: Optional[str] = Field(None, description="Task description", max_length=1000)
-    status: Optional[str] = Field(None, description="Task status")
-    priority: Optional[str] = Field(None, description="Task priority")
+    status: Optional[TaskStatus] = Field(None, description="Task status")
+    priority: Optional[TaskPriority] = Field(None, description="Task priority")
     due_date: Optional[str] = Field(None, description="Due date in YYYY-MM-DD format", pattern=r"^\d{4}-\d{2}-\d{2}$")
-    
-    @model_validator(mode='after')
-    def validate_priority_and_status(self) -> 'TaskUpdate':
-        allowed_priorities = ["low", "medium", "high"]
-        allowed_statuses = ["todo", "in_progress", "done"]
-        
-        if self.priority is not None and self.priority not in allowed_priorities:
-            raise ValueError(f"Priority must be one of: {', '.join(allowed_priorities)}")
-        
-        if self.status is not None and self.status not in allowed_statuses:
-            raise ValueError(f"Status must be one of: {', '.join(allowed_statuses)}")
-        
-        return self
 
 class TaskResponse(BaseModel):
     """Response model for task data."""
@@ -155,14 +176,19 @@ class TaskResponse(BaseModel):
     status: str = Field(description="Task status")
     priority: str = Field(description="Task priority")
     due_date: Optional[str] = Field(None, description="Due date in YYYY-MM-DD format")
-    created_at: str = Field(description="Creation timestamp in ISO format")
-    updated_at: str = Field(description="Last update timestamp in ISO format")
+    created_at: Optional[datetime] = Field(None, description="Creation timestamp in ISO format")
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp in ISO format")
 
     model_config = {"from_attributes": True}
 
 class TaskStatusUpdate(BaseModel):
     """Model for updating only task status."""
-    status: str = Field(description="New task status")
+    status: TaskStatus = Field(description="New task status")
+
+class TaskBulkStatusUpdate(BaseModel):
+    """Model for moving several tasks to the same status."""
+    ids: List[int] = Field(description="IDs of the tasks to update", min_length=1, max_length=5000)
+    status: TaskStatus = Field(description="New task status")
 
 class HealthResponse(BaseModel):
     """Health check response model."""
@@ -173,38 +199,223 @@ class ErrorResponse(BaseModel):
     """Error response model."""
     detail: str = Field(description="Error message")
 
-# Security setup
-security = HTTPBearer()
+# Security setup. Tokens are resolved by AuthMiddleware; the scheme is kept on
+# get_current_user so the OpenAPI docs still offer bearer authentication.
+security = HTTPBearer(auto_error=False)
 
-# Helper function to get current user
-def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)):
-    """Get current authenticated user from token."""
-    # For simplicity, we'll use username as token
-    username = credentials.credentials
+# Short-lived token -> user cache so bursts of requests skip the user lookup.
+# Keyed by the token's SHA-256 so raw credentials are not kept in memory.
+_user_cache = TTLCache(maxsize=10000, ttl=60)
+_user_cache_lock = threading.Lock()
+
+# Failed login counters per (client IP, username); throttled attempts never reach bcrypt
+_failed_logins = TTLCache(maxsize=100000, ttl=RateLimitConfig.FAILED_LOGIN_WINDOW)
+_failed_logins_lock = threading.Lock()
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def get_cached_user(token: str) -> Optional[SimpleNamespace]:
+    """Return the cached user for a valid, unexpired token without touching the database."""
+    # Decode first so token expiry is enforced even for cached users
+    if AuthManager.decode_access_token(token) is None:
+        return None
+    with _user_cache_lock:
+        return _user_cache.get(_token_cache_key(token))
+
+def resolve_user(token: str) -> Optional[SimpleNamespace]:
+    """Resolve a bearer token to the user's id/username/email, caching it on a miss.
+    
+    Failed lookups are never cached.
+    """
+    user_id = AuthManager.decode_access_token(token)
+    if user_id is None:
+        return None
+    
+    key = _token_cache_key(token)
+    with _user_cache_lock:
+        user = _user_cache.get(key)
+    if user is not None:
+        return user
+    
     with db_manager.get_session() as session:
-        user = session.query(UserModel).filter(
-            (UserModel.username == username) | (UserModel.email == username)
+        row = session.execute(
+            select(UserModel.id, UserModel.username, UserModel.email).where(UserModel.id == user_id)
         ).first()
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-        return user
+    if row is None:
+        return None
+    
+    # Plain attributes only: no session state or password hash held in the cache
+    user = SimpleNamespace(**row._asdict())
+    with _user_cache_lock:
+        _user_cache[key] = user
+    return user
+
+# Paths served without authentication; the middleware skips token resolution for them
+PUBLIC_PATHS = frozenset({
+    "/", "/health", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json",
+    "/auth/login", "/auth/register",
+})
+
+class AuthMiddleware:
+    """ASGI middleware that resolves the bearer token once per request.
+    
+    The user (or None) is stored on `request.state.user`. Cache hits are served
+    on the event loop; misses load the user in the threadpool.
+    """
+    
+    def __init__(self, app, public_paths=PUBLIC_PATHS):
+        self.app = app
+        self.public_paths = public_paths
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] not in self.public_paths:
+            user = None
+            token = self._bearer_token(scope)
+            if token:
+                user = get_cached_user(token)
+                if user is None:
+                    user = await run_in_threadpool(resolve_user, token)
+            scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
+    
+    @staticmethod
+    def _bearer_token(scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    return token.strip()
+                return None
+        return None
+
+api_app.add_middleware(AuthMiddleware)
+# Added last so it is outermost: compresses large task lists (small bodies are left as-is)
+api_app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Helper function to get current user
+async def get_current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(security)
+):
+    """Get the current user resolved by AuthMiddleware."""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    user = getattr(request.state, "user", None)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    return user
+
+# Database session dependency: one session per request, closed once the
+# response has been produced. Handlers (and any helpers they call) share it.
+def get_db():
+    """Yield a database session for the duration of the request."""
+    with db_manager.get_session() as session:
+        yield session
+
+# Helper function to convert TaskModel to the TaskResponse shape. Task endpoints
+# wrap the dict in an ORJSONResponse themselves, so FastAPI skips the
+# response_model validation and jsonable_encoder passes (response_model is only
+# used for the OpenAPI schema) and orjson formats the datetimes natively.
+def task_to_response(task: TaskModel) -> dict:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description or "",
+        "status": task.status,
+        "priority": task.priority,
+        "due_date": task.due_date,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+    }
+
+def stored_utc_now() -> datetime:
+    """Current UTC time as the task columns store and return it (naive, with microseconds)."""
+    return get_utc_now().replace(tzinfo=None)
+
+def get_user_task(session, task_id: int, user_id: int) -> Optional[TaskModel]:
+    """Load a task by ID if it belongs to the given user."""
+    # Session.get checks the identity map and reuses its cached primary-key lookup
+    task = session.get(TaskModel, task_id)
+    if task is None or task.user_id != user_id:
+        return None
+    return task
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+BULK_UPDATE_CHUNK_SIZE = 500
 
-# Helper function to convert TaskModel to TaskResponse
-def task_to_response(task: TaskModel) -> TaskResponse:
-    return TaskResponse(
-        id=task.id,
-        title=task.title,
-        description=task.description or "",
-        status=task.status,
+# Maximum number of tasks accepted by POST /tasks:batch
+MAX_BATCH_CREATE = 500
+
+def new_task_values(task: TaskCreate, user_id: int) -> dict:
+    """Normalize and sanitize a TaskCreate into column values for a new task."""
+    # Additional server-side validation
+    title = task.title.strip()
+    if not title:
+        raise HTTPException(status_code=400, detail="Title is required")
+    description = task.description.strip() if task.description else ""
+    
+    # priority and due_date are already validated by TaskCreate
+    return dict(
+        user_id=user_id,
+        # Sanitize inputs to prevent XSS
+        title=sanitize_text(title),
+        description=sanitize_text(description),
+        status="todo",
         priority=task.priority,
-        due_date=task.due_date,
-        created_at=task.created_at.isoformat() if task.created_at else "",
-        updated_at=task.updated_at.isoformat() if task.updated_at else ""
+        due_date=task.due_date
     )
 
+# Columns selected for list responses, labelled in TaskResponse order; rows are
+# serialized without building ORM objects
+TASK_LIST_COLUMNS = (
+    TaskModel.id, TaskModel.title,
+    func.coalesce(TaskModel.description, "").label("description"),
+    TaskModel.status, TaskModel.priority, TaskModel.due_date,
+    TaskModel.created_at, TaskModel.updated_at,
+)
+
+def rows_to_json(rows) -> bytes:
+    """Encode TASK_LIST_COLUMNS rows as a JSON array of TaskResponse objects.
+    
+    orjson formats the datetimes itself (same output as isoformat()), so the
+    whole list is converted in C without per-field Python work.
+    """
+    return orjson.dumps([row._asdict() for row in rows])
+
+# Serialized GET /tasks pages keyed by (user ID, ETag). The ETag is derived from
+# the user's task count and latest (microsecond) updated_at, so writes from other
+# workers or the dashboard produce a new key and stale pages age out; writes
+# through this worker's API also drop the user's pages straight away.
+_task_list_cache = TTLCache(maxsize=1024, ttl=300)
+_task_list_cache_lock = threading.Lock()
+
+def invalidate_task_list_cache(user_id: int) -> None:
+    """Drop this worker's cached GET /tasks pages for a user."""
+    with _task_list_cache_lock:
+        for key in [key for key in _task_list_cache if key[0] == user_id]:
+            _task_list_cache.pop(key, None)
+
+# Full-text search helpers
+_tasks_fts = table(TASKS_FTS_TABLE, column("rowid"))
+
+def fts_match_query(search: str) -> Optional[str]:
+    """Build a trigram FTS5 MATCH expression finding the search as a substring.
+    
+    Returns None for searches shorter than a trigram, which the index cannot
+    serve; those fall back to LIKE.
+    """
+    if len(search) < 3:
+        return None
+    return '"' + search.replace('"', '""') + '"'
+
+# Endpoints that use the (synchronous) database session or bcrypt are declared
+# with plain `def` so FastAPI runs them in its threadpool instead of blocking
+# the event loop for the duration of the query.
+
 @api_app.post("/auth/register", response_model=UserResponse, status_code=201, tags=["auth"])
 @limiter.limit(RateLimitConfig.REGISTER_LIMIT)
-async def register_user(request: Request, user_data: UserRegister):
+def register_user(request: Request, user_data: UserRegister):
     """
     Register a new user account.
     
@@ -217,44 +428,47 @@ async def register_user(request: Request, user_data: UserRegister):
     
     Returns the user ID, username, and email.
     """
-    # Additional validation
-    username = user_data.username.strip()
-    email = user_data.email.strip().lower()
-    password = user_data.password
-    
-    # Sanitize username to prevent XSS (though usernames shouldn't contain HTML)
-    username = bleach.clean(username)
-    
-    # Validate username format (additional server-side validation)
-    if not username.replace("_", "").isalnum():
-        raise HTTPException(status_code=400, detail="Username can only contain letters, numbers, and underscores")
-    
-    # Validate email format (additional server-side validation)
-    if "@" not in email or "." not in email.split("@")[-1]:
-        raise HTTPException(status_code=400, detail="Invalid email format")
-    
-    user = AuthManager.create_user(username, email, password)
+    # UserRegister already restricts usernames to [a-zA-Z0-9_], so they need
+    # no stripping or HTML escaping; emails only need case-folding
+    user = AuthManager.create_user(user_data.username, user_data.email.lower(), user_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Username or email already exists")
     return UserResponse(id=user['id'], username=user['username'], email=user['email'])
 
-@api_app.post("/auth/login", response_model=UserResponse, tags=["auth"])
+@api_app.post("/auth/login", response_model=LoginResponse, tags=["auth"])
 @limiter.limit(RateLimitConfig.LOGIN_LIMIT)
-async def login_user(request: Request, user_data: UserLogin):
+def login_user(request: Request, user_data: UserLogin):
     """
     Login existing user.
     
-    Authenticates user credentials and returns the user information including user ID.
+    Authenticates user credentials and returns the user information including user ID,
+    together with an access token to send as `Authorization: Bearer <access_token>`.
     
     - **username**: Username or email address
     - **password**: User password
     
-    Returns the user ID, username, and email.
+    Returns the user ID, username, email, and access token.
     """
+    attempt_key = (client_ip(request), user_data.username.lower())
+    with _failed_logins_lock:
+        failed_attempts = _failed_logins.get(attempt_key, 0)
+    if failed_attempts >= RateLimitConfig.MAX_FAILED_LOGINS:
+        raise HTTPException(status_code=429, detail="Too many failed login attempts. Please try again later.")
+    
     user = AuthManager.authenticate_user(user_data.username, user_data.password)
     if not user:
+        with _failed_logins_lock:
+            _failed_logins[attempt_key] = _failed_logins.get(attempt_key, 0) + 1
         raise HTTPException(status_code=401, detail="Invalid username or password")
-    return UserResponse(id=user['id'], username=user['username'], email=user['email'])
+    
+    with _failed_logins_lock:
+        _failed_logins.pop(attempt_key, None)
+    return LoginResponse(
+        id=user['id'],
+        username=user['username'],
+        email=user['email'],
+        access_token=AuthManager.create_access_token(user)
+    )
 
 @api_app.get("/auth/me", response_model=UserResponse, tags=["auth"])
 async def get_current_user_info(current_user=Depends(get_current_user)):
@@ -267,41 +481,98 @@ async def get_current_user_info(current_user=Depends(get_current_user)):
     return UserResponse(id=current_user.id, username=current_user.username, email=current_user.email)
 
 @api_app.get("/tasks", response_model=List[TaskResponse], tags=["tasks"])
-async def get_tasks(
+def get_tasks(
+    request: Request,
     status: Optional[str] = Query(None, description="Filter by task status"),
     priority: Optional[str] = Query(None, description="Filter by priority level"),
     search: Optional[str] = Query(None, description="Search in title and description"),
-    current_user=Depends(get_current_user)
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of tasks to return"),
+    cursor: Optional[int] = Query(None, description="Return tasks older than this task ID (from X-Next-Cursor)"),
+    current_user=Depends(get_current_user),
+    session=Depends(get_db)
 ):
     """
-    Get all tasks for the authenticated user with optional filtering.
+    Get a page of tasks for the authenticated user with optional filtering.
     
-    Returns a list of tasks belonging to the authenticated user, filtered by
+    Returns tasks belonging to the authenticated user, newest first, filtered by
     status, priority, and/or search query. All filters are optional and can be combined.
+    When more tasks are available, the `X-Next-Cursor` response header holds the
+    value to pass as `cursor` for the next page.
+    
+    Responses carry an `ETag`; send it back in `If-None-Match` to get an empty
+    `304 Not Modified` while the user's tasks are unchanged.
     
     **Authentication Required**: Include Bearer token in Authorization header.
     
     - **status**: Filter by task status (todo, in_progress, done)
     - **priority**: Filter by priority level (low, medium, high)
     - **search**: Search within title and description (case-insensitive)
+    - **limit**: Page size (1-200, default 50)
+    - **cursor**: Keyset cursor from the previous page's `X-Next-Cursor` header
     
-    Example: `/tasks?status=todo&priority=high&search=urgent`
+    Example: `/tasks?status=todo&priority=high&search=urgent&limit=20`
     """
-    with db_manager.get_session() as session:
-        query = session.query(TaskModel).filter(TaskModel.user_id == current_user.id)
-        
-        if status:
-            query = query.filter(TaskModel.status == status)
-        if priority:
-            query = query.filter(TaskModel.priority == priority)
-        if search:
-            query = query.filter(
-                TaskModel.title.contains(search) | 
-                TaskModel.description.contains(search)
+    # Cheap change check (served by ix_tasks_user_updated) before running the real query
+    last_updated, task_count = session.execute(
+        select(func.max(TaskModel.updated_at), func.count(TaskModel.id))
+        .where(TaskModel.user_id == current_user.id)
+    ).one()
+    etag_source = f"{last_updated}:{task_count}:{request.url.query}"
+    etag = '"' + hashlib.blake2b(etag_source.encode(), digest_size=8).hexdigest() + '"'
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    cache_key = (current_user.id, etag)
+    with _task_list_cache_lock:
+        cached = _task_list_cache.get(cache_key)
+    if cached is not None:
+        content, headers = cached
+        return Response(content=content, media_type="application/json", headers=headers)
+    
+    # Composed as a lambda_stmt: each combination of filters is compiled once
+    # and later requests only swap in the bound values
+    user_id = current_user.id
+    stmt = lambda_stmt(lambda: select(*TASK_LIST_COLUMNS).where(TaskModel.user_id == user_id))
+    
+    if status:
+        stmt += lambda s: s.where(TaskModel.status == status)
+    if priority:
+        stmt += lambda s: s.where(TaskModel.priority == priority)
+    if search:
+        match_query = fts_match_query(search)
+        if match_query and has_task_fts(session.get_bind()):
+            # Inverted-index lookup instead of a LIKE '%search%' scan; the
+            # subquery is built outside the lambda so it is tracked as a
+            # closure element rather than evaluated during lambda analysis
+            fts_ids = select(_tasks_fts.c.rowid).where(
+                literal_column(TASKS_FTS_TABLE).op("MATCH")(match_query)
             )
-        
-        tasks = query.all()
-        return [task_to_response(task) for task in tasks]
+            stmt += lambda s: s.where(TaskModel.id.in_(fts_ids))
+        else:
+            # Escape by hand so % and _ in the search term stay literal; the
+            # escaped value is then a plain bound parameter of the lambda
+            pattern = search.replace("/", "//").replace("%", "/%").replace("_", "/_")
+            stmt += lambda s: s.where(
+                TaskModel.title.contains(pattern, escape="/") | 
+                TaskModel.description.contains(pattern, escape="/")
+            )
+    
+    if cursor is not None:
+        stmt += lambda s: s.where(TaskModel.id < cursor)
+    
+    # Fetch one extra row to know whether another page exists
+    page_size = limit + 1
+    stmt += lambda s: s.order_by(TaskModel.id.desc()).limit(page_size)
+    rows = session.execute(stmt).all()
+    headers = {"ETag": etag}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = str(rows[-1].id)
+    content = rows_to_json(rows)
+    with _task_list_cache_lock:
+        _task_list_cache[cache_key] = (content, headers)
+    # Pre-encoded body; response_model is kept for the OpenAPI schema only
+    return Response(content=content, media_type="application/json", headers=headers)
 
 @api_app.get(
     "/tasks/{task_id}",
@@ -312,7 +583,7 @@ async def get_tasks(
         404: {"description": "Task not found", "model": ErrorResponse},
     }
 )
-async def get_task(task_id: int, current_user=Depends(get_current_user)):
+def get_task(task_id: int, current_user=Depends(get_current_user), session=Depends(get_db)):
     """
     Get a specific task by ID.
     
@@ -322,14 +593,10 @@ async def get_task(task_id: int, current_user=Depends(get_current_user)):
     
     - **task_id**: The unique identifier of the task
     """
-    with db_manager.get_session() as session:
-        task = session.query(TaskModel).filter(
-            TaskModel.id == task_id,
-            TaskModel.user_id == current_user.id
-        ).first()
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        return task_to_response(task)
+    task = get_user_task(session, task_id, current_user.id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return ORJSONResponse(task_to_response(task))
 
 @api_app.post(
     "/tasks",
@@ -341,7 +608,8 @@ async def get_task(task_id: int, current_user=Depends(get_current_user)):
         400: {"description": "Invalid input data", "model": ErrorResponse},
     }
 )
-async def create_task(task: TaskCreate, current_user=Depends(get_current_user)):
+@limiter.limit(RateLimitConfig.API_LIMIT)
+def create_task(request: Request, task: TaskCreate, current_user=Depends(get_current_user), session=Depends(get_db)):
     """
     Create a new task for the authenticated user.
     
@@ -355,45 +623,70 @@ async def create_task(task: TaskCreate, current_user=Depends(get_current_user)):
     - **priority**: Task priority (low, medium, high)
     - **due_date**: Optional due date in YYYY-MM-DD format
     """
-    # Additional server-side validation
-    title = task.title.strip()
-    description = task.description.strip() if task.description else ""
-    priority = task.priority
-    due_date = task.due_date
-    
-    # Validate title
-    if not title:
-        raise HTTPException(status_code=400, detail="Title is required")
-    
-    # Sanitize inputs to prevent XSS
-    title = bleach.clean(title)
-    description = bleach.clean(description)
-    
-    # Validate priority
-    allowed_priorities = ["low", "medium", "high"]
-    if priority not in allowed_priorities:
-        raise HTTPException(status_code=400, detail=f"Priority must be one of: {', '.join(allowed_priorities)}")
+    values = new_task_values(task, current_user.id)
+    if session.get_bind().dialect.insert_returning:
+        # Single round-trip: INSERT ... RETURNING the response columns
+        new_task = session.execute(insert(TaskModel).values(**values).returning(*TASK_LIST_COLUMNS)).one()
+    else:
+        # e.g. MySQL: flush assigns the id. The response is built from this
+        # object, so stamp it with the value the row will read back as
+        now = stored_utc_now()
+        new_task = TaskModel(**values, created_at=now, updated_at=now)
+        session.add(new_task)
+        session.flush()
+    # Build the response before commit expires the instance (avoids a refresh SELECT)
+    response = task_to_response(new_task)
+    session.commit()
+    invalidate_task_list_cache(current_user.id)
+    return ORJSONResponse(response, status_code=201)
+
+@api_app.post(
+    "/tasks:batch",
+    response_model=List[TaskResponse],
+    status_code=201,
+    tags=["tasks"],
+    responses={
+        201: {"description": "Tasks created successfully", "model": List[TaskResponse]},
+        400: {"description": "Invalid input data", "model": ErrorResponse},
+    }
+)
+@limiter.limit(RateLimitConfig.API_LIMIT)
+def create_tasks_batch(
+    request: Request,
+    tasks: List[TaskCreate] = Body(..., min_length=1, max_length=MAX_BATCH_CREATE),
+    current_user=Depends(get_current_user),
+    session=Depends(get_db)
+):
+    """
+    Create several tasks for the authenticated user in one request.
     
-    # Validate due_date format if provided
-    if due_date:
-        import re
-        date_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-        if not date_pattern.match(due_date):
-            raise HTTPException(status_code=400, detail="Due date must be in YYYY-MM-DD format")
+    Accepts a JSON array of task objects (same fields as `POST /tasks`, up to 500)
+    and inserts them in a single transaction. Either all tasks are created or,
+    if any is invalid, none are. Returns the created tasks in request order.
     
-    with db_manager.get_session() as session:
-        new_task = TaskModel(
-            user_id=current_user.id,
-            title=title,
-            description=description,
-            status="todo",
-            priority=priority,
-            due_date=due_date
-        )
-        session.add(new_task)
-        session.commit()
-        session.refresh(new_task)
-        return task_to_response(new_task)
+    **Authentication Required**: Include Bearer token in Authorization header.
+    """
+    # Stamp the whole batch with one clock read instead of a column default per row;
+    # naive like the stored value, since without RETURNING the response echoes it
+    now = stored_utc_now()
+    rows = [
+        dict(new_task_values(task, current_user.id), created_at=now, updated_at=now)
+        for task in tasks
+    ]
+    if session.get_bind().dialect.insert_returning:
+        # One executemany INSERT ... RETURNING, rows kept in request order
+        new_tasks = session.execute(
+            insert(TaskModel).returning(*TASK_LIST_COLUMNS, sort_by_parameter_order=True),
+            rows
+        ).all()
+    else:
+        new_tasks = [TaskModel(**values) for values in rows]
+        session.add_all(new_tasks)
+        session.flush()
+    response = [task_to_response(task) for task in new_tasks]
+    session.commit()
+    invalidate_task_list_cache(current_user.id)
+    return ORJSONResponse(response, status_code=201)
 
 @api_app.put(
     "/tasks/{task_id}",
@@ -405,7 +698,7 @@ async def create_task(task: TaskCreate, current_user=Depends(get_current_user)):
         400: {"description": "Invalid input data", "model": ErrorResponse},
     }
 )
-async def update_task(task_id: int, task_update: TaskUpdate, current_user=Depends(get_current_user)):
+def update_task(task_id: int, task_update: TaskUpdate, current_user=Depends(get_current_user), session=Depends(get_db)):
     """
     Update an existing task for the authenticated user.
     
@@ -417,74 +710,107 @@ async def update_task(task_id: int, task_update: TaskUpdate, current_user=Depend
     - **task_id**: The unique identifier of the task to update
     - **task_update**: Object containing fields to update
     """
-    # Additional server-side validation
-    allowed_priorities = ["low", "medium", "high"]
-    allowed_statuses = ["todo", "in_progress", "done"]
-    
+    # Normalize each provided field once; lengths are bounded by TaskUpdate
+    values = {}
     if task_update.title is not None:
         title = task_update.title.strip()
         if not title:
             raise HTTPException(status_code=400, detail="Title cannot be empty")
-        if len(title) > 255:
-            raise HTTPException(status_code=400, detail="Title must be less than 255 characters")
         # Sanitize title to prevent XSS
-        title = bleach.clean(title)
-    
+        values["title"] = sanitize_text(title)
     if task_update.description is not None:
-        description = task_update.description.strip()
-        if len(description) > 1000:
-            raise HTTPException(status_code=400, detail="Description must be less than 1000 characters")
         # Sanitize description to prevent XSS
-        description = bleach.clean(description)
-    
-    if task_update.priority is not None and task_update.priority not in allowed_priorities:
-        raise HTTPException(status_code=400, detail=f"Priority must be one of: {', '.join(allowed_priorities)}")
-    
-    if task_update.status is not None and task_update.status not in allowed_statuses:
-        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(allowed_statuses)}")
+        values["description"] = sanitize_text(task_update.description.strip())
     
+    # priority, status and due_date are already validated by TaskUpdate
+    if task_update.status is not None:
+        values["status"] = task_update.status
+    if task_update.priority is not None:
+        values["priority"] = task_update.priority
     if task_update.due_date is not None:
-        import re
-        date_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-        if task_update.due_date and not date_pattern.match(task_update.due_date):
-            raise HTTPException(status_code=400, detail="Due date must be in YYYY-MM-DD format")
+        values["due_date"] = task_update.due_date
     
-    with db_manager.get_session() as session:
-        task = session.query(TaskModel).filter(
-            TaskModel.id == task_id,
-            TaskModel.user_id == current_user.id
-        ).first()
+    if not values:
+        task = get_user_task(session, task_id, current_user.id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-        
-        if task_update.title is not None:
-            task.title = task_update.title.strip()
-        if task_update.description is not None:
-            task.description = task_update.description.strip()
-        if task_update.status is not None:
-            task.status = task_update.status
-        if task_update.priority is not None:
-            task.priority = task_update.priority
-        if task_update.due_date is not None:
-            task.due_date = task_update.due_date
-        
-        session.commit()
-        session.refresh(task)
-        return task_to_response(task)
+        return ORJSONResponse(task_to_response(task))
+    
+    stmt = (
+        update(TaskModel)
+        .where(TaskModel.id == task_id, TaskModel.user_id == current_user.id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if session.get_bind().dialect.update_returning:
+        # Single round-trip: UPDATE ... RETURNING the response columns
+        task = session.execute(stmt.returning(*TASK_LIST_COLUMNS)).first()
+    else:
+        # e.g. MySQL: no RETURNING, so re-read the row after updating it
+        task = None
+        if session.execute(stmt).rowcount:
+            task = get_user_task(session, task_id, current_user.id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    session.commit()
+    invalidate_task_list_cache(current_user.id)
+    return ORJSONResponse(task_to_response(task))
+
+@api_app.patch(
+    "/tasks/status",
+    tags=["tasks"],
+    responses={
+        200: {"description": "Statuses updated successfully"},
+        422: {"description": "Invalid status value or empty ID list"},
+    }
+)
+def update_tasks_status(
+    bulk_update: TaskBulkStatusUpdate,
+    current_user=Depends(get_current_user),
+    session=Depends(get_db)
+):
+    """
+    Update the status of several tasks at once.
+    
+    Moves every listed task owned by the authenticated user to the given status
+    in a single transaction. IDs that do not exist or belong to another user
+    are ignored; `updated` reports how many tasks were changed.
+    
+    **Authentication Required**: Include Bearer token in Authorization header.
+    
+    - **ids**: Task IDs to update
+    - **status**: New status value (todo, in_progress, done)
+    """
+    ids = list(dict.fromkeys(bulk_update.ids))
+    updated = 0
+    for start in range(0, len(ids), BULK_UPDATE_CHUNK_SIZE):
+        chunk = ids[start:start + BULK_UPDATE_CHUNK_SIZE]
+        result = session.execute(
+            update(TaskModel)
+            .where(TaskModel.id.in_(chunk), TaskModel.user_id == current_user.id)
+            .values(status=bulk_update.status)
+        )
+        updated += result.rowcount
+    session.commit()
+    invalidate_task_list_cache(current_user.id)
+    return {"message": "Task statuses updated successfully", "updated": updated, "new_status": bulk_update.status}
 
 @api_app.patch(
     "/tasks/{task_id}/status",
     tags=["tasks"],
+    status_code=204,
+    response_class=Response,
     responses={
-        200: {"description": "Status updated successfully"},
+        204: {"description": "Status updated successfully"},
         404: {"description": "Task not found", "model": ErrorResponse},
-        400: {"description": "Invalid status value", "model": ErrorResponse},
+        422: {"description": "Invalid status value"},
     }
 )
-async def update_task_status(
+def update_task_status(
     task_id: int,
     status_update: TaskStatusUpdate,
-    current_user=Depends(get_current_user)
+    current_user=Depends(get_current_user),
+    session=Depends(get_db)
 ):
     """
     Update only the task status.
@@ -497,27 +823,29 @@ async def update_task_status(
     - **task_id**: The unique identifier of the task
     - **status**: New status value (todo, in_progress, done)
     """
-    with db_manager.get_session() as session:
-        task = session.query(TaskModel).filter(
-            TaskModel.id == task_id,
-            TaskModel.user_id == current_user.id
-        ).first()
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        
-        task.status = status_update.status
-        session.commit()
-        return {"message": "Task status updated successfully", "task_id": task_id, "new_status": status_update.status}
+    result = session.execute(
+        update(TaskModel)
+        .where(TaskModel.id == task_id, TaskModel.user_id == current_user.id)
+        .values(status=status_update.status)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Task not found")
+    session.commit()
+    invalidate_task_list_cache(current_user.id)
+    return Response(status_code=204)
 
 @api_app.delete(
     "/tasks/{task_id}",
     tags=["tasks"],
+    status_code=204,
+    response_class=Response,
     responses={
-        200: {"description": "Task deleted successfully"},
+        204: {"description": "Task deleted successfully"},
         404: {"description": "Task not found", "model": ErrorResponse},
     }
 )
-async def delete_task(task_id: int, current_user=Depends(get_current_user)):
+def delete_task(task_id: int, current_user=Depends(get_current_user), session=Depends(get_db)):
     """
     Delete a task.
     
@@ -527,17 +855,16 @@ async def delete_task(task_id: int, current_user=Depends(get_current_user)):
     
     - **task_id**: The unique identifier of the task to delete
     """
-    with db_manager.get_session() as session:
-        task = session.query(TaskModel).filter(
-            TaskModel.id == task_id,
-            TaskModel.user_id == current_user.id
-        ).first()
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        
-        session.delete(task)
-        session.commit()
-        return {"message": "Task deleted successfully", "task_id": task_id}
+    result = session.execute(
+        delete(TaskModel)
+        .where(TaskModel.id == task_id, TaskModel.user_id == current_user.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Task not found")
+    session.commit()
+    invalidate_task_list_cache(current_user.id)
+    return Response(status_code=204)
 
 @api_app.get(
     "/",
@@ -555,13 +882,36 @@ async def root():
 @api_app.get(
     "/health",
     tags=["health"],
-    response_model=HealthResponse
+    response_model=HealthResponse,
+    responses={503: {"description": "Database unreachable", "model": HealthResponse}}
 )
-async def health_check():
+async def health_check(response: Response):
     """
     Health check endpoint.
     
     Returns the current health status of the API and database connection.
-    This endpoint is useful for monitoring and load balancer health checks.
+    This endpoint is useful for monitoring and load balancer health checks:
+    it answers 503 with status "degraded" when the database cannot be reached.
     """
-    return HealthResponse(status="healthy", database="connected")
\ No newline at end of file
+    if await run_in_threadpool(db_manager.ping):
+        return HealthResponse(status="healthy", database="connected")
+    response.status_code = 503
+    return HealthResponse(status="degraded", database="down")
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # Every worker must share JWT_SECRET_KEY to accept each other's tokens,
+    # so only fan out across cores when it is configured.
+    default_workers = (os.cpu_count() or 1) if os.getenv("JWT_SECRET_KEY") else 1
+    uvicorn.run(
+        "task_dashboard.api:api_app",
+        host=os.getenv("API_HOST", "0.0.0.0"),
+        port=int(os.getenv("API_PORT", "8000")),
+        workers=int(os.getenv("WORKERS", default_workers)),
+        loop="uvloop",
+        http="httptools",
+        # Shed load with 503s instead of queueing without bound
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", "1000")),
+        timeout_keep_alive=int(os.getenv("TIMEOUT_KEEP_ALIVE", "30")),
+    )
\ No newline at end of file
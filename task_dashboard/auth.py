@@ -2,10 +2,70 @@
 
 import bcrypt
 import hashlib
+import hmac
+import logging
+import os
 import secrets
+import threading
+import time
 from typing import Optional
+
+import jwt
+from cachetools import LRUCache
+from sqlalchemy import select, union_all
+from sqlalchemy.exc import IntegrityError, OperationalError
+
 from task_dashboard.database import UserModel, TaskModel, db_manager
 
+# JWT settings. Set JWT_SECRET_KEY in production so tokens survive restarts
+# and are accepted by every worker process.
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY") or secrets.token_urlsafe(32)
+JWT_ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+
+logger = logging.getLogger(__name__)
+
+# Verified token payloads keyed by the token's SHA-256, so raw tokens are not
+# kept in memory
+_token_payloads = LRUCache(maxsize=10000)
+_token_payloads_lock = threading.Lock()
+
+def _decode_token(token: str) -> dict:
+    """Verify a token's signature once; invalid tokens raise and are never cached."""
+    key = hashlib.sha256(token.encode()).hexdigest()
+    with _token_payloads_lock:
+        payload = _token_payloads.get(key)
+    if payload is None:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        with _token_payloads_lock:
+            _token_payloads[key] = payload
+    return payload
+
+def _find_user_by_username_or_email(session, username: str, email: str) -> Optional[UserModel]:
+    """Look up a user by username or email as two unique-index probes.
+    
+    An OR across two columns can fall back to a table scan, so each column
+    is queried separately and the results combined with UNION ALL.
+    """
+    lookup = union_all(
+        select(UserModel).where(UserModel.username == username),
+        select(UserModel).where(UserModel.email == email),
+    )
+    return session.execute(select(UserModel).from_statement(lookup)).scalars().first()
+
+def _find_user_by_login(session, login: str) -> Optional[UserModel]:
+    """Look up a user by a login identifier with a single unique-index probe.
+    
+    Identifiers containing "@" are looked up by email first; the username
+    probe only runs when that misses.
+    """
+    columns = (UserModel.email, UserModel.username) if "@" in login else (UserModel.username,)
+    for column in columns:
+        user = session.execute(select(UserModel).where(column == login)).scalar_one_or_none()
+        if user:
+            return user
+    return None
+
 class AuthManager:
     """Handles user authentication and session management."""
     
@@ -19,27 +79,51 @@ class AuthManager:
     @staticmethod
     def verify_password(password: str, stored_hash: str) -> bool:
         """Verify password against stored hash."""
-        try:
-            # First try bcrypt (new format)
-            return bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
-        except:
-            # If bcrypt fails, try old SHA-256 format for backward compatibility
+        if stored_hash.startswith('$2'):
+            # bcrypt (new format): $2a$/$2b$/$2y$
             try:
-                salt, hash_value = stored_hash.split('$')
-                password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-                return password_hash == hash_value
-            except:
+                return bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8'))
+            except ValueError:
                 return False
+        
+        # Old "salt$sha256" format, kept for backward compatibility
+        salt, sep, hash_value = stored_hash.rpartition('$')
+        if not sep:
+            return False
+        password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
+        return hmac.compare_digest(password_hash, hash_value)
+    
+    @staticmethod
+    def create_access_token(user: dict) -> str:
+        """Issue a signed access token for the given user."""
+        payload = {
+            "sub": str(user['id']),
+            "exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        }
+        return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    
+    @staticmethod
+    def decode_access_token(token: str) -> Optional[int]:
+        """Return the user ID from a valid, unexpired token, or None."""
+        try:
+            payload = _decode_token(token)
+        except jwt.PyJWTError:
+            return None
+        # The decode is cached, so expiry has to be re-checked on every call
+        if payload.get("exp", 0) < time.time():
+            return None
+        try:
+            return int(payload["sub"])
+        except (KeyError, ValueError):
+            return None
     
     @staticmethod
     def create_user(username: str, email: str, password: str) -> Optional[dict]:
         """Create new user account."""
         try:
-            with db_manager.get_session() as session:
+            with db_manager.session_scope() as session:
                 # Check if username or email already exists
-                existing_user = session.query(UserModel).filter(
-                    (UserModel.username == username) | (UserModel.email == email)
-                ).first()
+                existing_user = _find_user_by_username_or_email(session, username, email)
                 
                 if existing_user:
                     return None
@@ -52,16 +136,19 @@ class AuthManager:
                 )
                 
                 session.add(user)
-                session.commit()
-                session.refresh(user)
-                
-                return {
+                # Flush for the generated id and read it before commit expires
+                # the instance, instead of refreshing with another SELECT
+                session.flush()
+                created = {
                     'id': user.id,
                     'username': user.username,
                     'email': user.email
                 }
-        except Exception as e:
-            print(f"Error creating user: {e}")
+            
+            return created
+        except (IntegrityError, OperationalError):
+            # IntegrityError: a concurrent registration took the username/email
+            logger.warning("create_user failed for %r", username, exc_info=True)
             return None
     
     @staticmethod
@@ -69,9 +156,7 @@ class AuthManager:
         """Authenticate user with username/email and password."""
         try:
             with db_manager.get_session() as session:
-                user = session.query(UserModel).filter(
-                    (UserModel.username == username) | (UserModel.email == username)
-                ).first()
+                user = _find_user_by_login(session, username)
                 
                 if user and AuthManager.verify_password(password, user.password_hash):
                     return {
@@ -80,8 +165,8 @@ class AuthManager:
                         'email': user.email
                     }
                 return None
-        except Exception as e:
-            print(f"Error authenticating user: {e}")
+        except OperationalError:
+            logger.warning("authenticate_user failed", exc_info=True)
             return None
     
     @staticmethod
@@ -89,7 +174,7 @@ class AuthManager:
         """Get user by ID."""
         try:
             with db_manager.get_session() as session:
-                user = session.query(UserModel).filter(UserModel.id == user_id).first()
+                user = session.get(UserModel, user_id)
                 if user:
                     return {
                         'id': user.id,
@@ -97,6 +182,6 @@ class AuthManager:
                         'email': user.email
                     }
                 return None
-        except Exception as e:
-            print(f"Error getting user: {e}")
+        except OperationalError:
+            logger.warning("get_user_by_id failed for %s", user_id, exc_info=True)
             return None
\ No newline at end of file
@@ -1,49 +1,24 @@
 """UI components for task dashboard application."""
 
 import reflex as rx
-from task_dashboard.models import Task
+from task_dashboard.models import TaskView
 from task_dashboard.state import State
 
-def task_item(task: Task) -> rx.Component:
-    """Individual task item component with modern design."""
-    priority_color = rx.match(
-        task.priority,
-        ("low", "blue"),
-        ("medium", "yellow"),
-        ("high", "red"),
-        "gray"
-    )
-    
-    status_icon = rx.match(
-        task.status,
-        ("todo", "circle"),
-        ("in_progress", "loader"),
-        ("done", "circle-check"),
-        "circle"
-    )
-    
-    status_color = rx.match(
-        task.status,
-        ("todo", "text-orange-500"),
-        ("in_progress", "text-yellow-500"),
-        ("done", "text-green-500"),
-        "text-gray-500"
-    )
-    
-    priority_gradient = rx.match(
-        task.priority,
-        ("low", "bg-gradient-to-br from-blue-50 to-blue-100 dark:from-blue-900/20 dark:to-blue-800/20"),
-        ("medium", "bg-gradient-to-br from-yellow-50 to-yellow-100 dark:from-yellow-900/20 dark:to-yellow-800/20"),
-        ("high", "bg-gradient-to-br from-red-50 to-red-100 dark:from-red-900/20 dark:to-red-800/20"),
-        "bg-gray-50 dark:bg-gray-800/50"
-    )
+@rx.memo
+def task_item(task: TaskView) -> rx.Component:
+    """Individual task item component with modern design.
     
+    Memoized, so React only re-renders the cards whose task changed. Being a
+    memo component, it must be called with keyword arguments; pass `key=task.id`
+    so React tracks cards by task rather than by list position.
+    Labels, colors and icons come precomputed on the TaskView (see State.tasks_by_status).
+    """
     return rx.card(
         rx.vstack(
             # Header with title and priority badge
             rx.hstack(
                 rx.hstack(
-                    rx.icon(status_icon, class_name=f"w-5 h-5 {status_color} flex-shrink-0"),
+                    rx.icon(task.status_icon, class_name=f"w-5 h-5 {task.status_color} flex-shrink-0"),
                     rx.text(
                         task.title, 
                         font_weight="bold", 
@@ -55,14 +30,8 @@ def task_item(task: Task) -> rx.Component:
                     min_width="0"
                 ),
                 rx.badge(
-                    rx.match(
-                        task.priority,
-                        ("low", State.t_low.title()),
-                        ("medium", State.t_medium.title()),
-                        ("high", State.t_high.title()),
-                        task.priority.title()
-                    ),
-                    color_scheme=priority_color,
+                    task.priority_label,
+                    color_scheme=task.priority_color,
                     variant="surface",
                     size="2",
                     class_name="font-medium flex-shrink-0"
@@ -86,60 +55,45 @@ def task_item(task: Task) -> rx.Component:
                 )
             ),
             
-            # Compact metadata row
-            rx.hstack(
+            # Compact metadata row, built from plain elements (no Radix Flex/Text) to keep the card's tree small
+            rx.el.div(
                 # Due date
-                rx.hstack(
+                rx.el.div(
                     rx.icon("calendar-days", class_name="w-3.5 h-3.5 text-blue-500"),
                     rx.cond(
                         task.due_date != "",
-                        rx.text(
+                        rx.el.span(
                             task.due_date, 
                             class_name="text-xs text-blue-600 dark:text-blue-400"
                         ),
-                        rx.text(
+                        rx.el.span(
                             "No due", 
                             class_name="text-xs text-gray-400"
                         )
                     ),
-                    spacing="1",
-                    align="center"
+                    class_name="flex items-center gap-1"
                 ),
                 
                 # Created date
-                rx.hstack(
+                rx.el.div(
                     rx.icon("clock", class_name="w-3.5 h-3.5 text-green-500"),
-                    rx.text(
-                        rx.cond(
-                            task.created_at != "",
-                            task.created_at[:10],
-                            "Recent"
-                        ), 
+                    rx.el.span(
+                        task.created_at_date,
                         class_name="text-xs text-green-600 dark:text-green-400"
                     ),
-                    spacing="1",
-                    align="center"
+                    class_name="flex items-center gap-1"
                 ),
                 
                 # Status
-                rx.hstack(
+                rx.el.div(
                     rx.icon("tag", class_name="w-3.5 h-3.5 text-purple-500"),
-                    rx.text(
-                        rx.match(
-                            task.status,
-                            ("todo", State.t_todo.title()),
-                            ("in_progress", State.t_in_progress.title()),
-                            ("done", State.t_done.title()),
-                            task.status.title()
-                        ),
+                    rx.el.span(
+                        task.status_label,
                         class_name="text-xs text-purple-600 dark:text-purple-400 font-medium"
                     ),
-                    spacing="1",
-                    align="center"
+                    class_name="flex items-center gap-1"
                 ),
-                spacing="4",
-                align="center",
-                class_name="flex-wrap"
+                class_name="flex flex-wrap items-center gap-4"
             ),
             
             # Actions - improved layout
@@ -148,12 +102,8 @@ def task_item(task: Task) -> rx.Component:
                 # Status buttons for direct clicking
                 rx.hstack(
                     rx.button(
-                        rx.cond(
-                            State.current_language == "zh",
-                            "待办",
-                            "To Do"
-                        ),
-                        on_click=lambda: State.update_task_status(task.id, "todo"),
+                        State.status_labels["todo"],
+                        on_click=State.update_task_status(task.id, "todo"),
                         size="1",
                         variant=rx.cond(task.status == "todo", "surface", "ghost"),
                         color_scheme=rx.cond(task.status == "todo", "orange", "gray"),
@@ -164,12 +114,8 @@ def task_item(task: Task) -> rx.Component:
                         )
                     ),
                     rx.button(
-                        rx.cond(
-                            State.current_language == "zh",
-                            "进行中",
-                            "In Progress"
-                        ),
-                        on_click=lambda: State.update_task_status(task.id, "in_progress"),
+                        State.status_labels["in_progress"],
+                        on_click=State.update_task_status(task.id, "in_progress"),
                         size="1",
                         variant=rx.cond(task.status == "in_progress", "surface", "ghost"),
                         color_scheme=rx.cond(task.status == "in_progress", "yellow", "gray"),
@@ -180,12 +126,8 @@ def task_item(task: Task) -> rx.Component:
                         )
                     ),
                     rx.button(
-                        rx.cond(
-                            State.current_language == "zh",
-                            "已完成",
-                            "Done"
-                        ),
-                        on_click=lambda: State.update_task_status(task.id, "done"),
+                        State.status_labels["done"],
+                        on_click=State.update_task_status(task.id, "done"),
                         size="1",
                         variant=rx.cond(task.status == "done", "surface", "ghost"),
                         color_scheme=rx.cond(task.status == "done", "green", "gray"),
@@ -203,19 +145,19 @@ def task_item(task: Task) -> rx.Component:
                 rx.hstack(
                     rx.button(
                         rx.icon("pencil", class_name="w-3.5 h-3.5"),
-                        on_click=lambda: State.edit_task(task.id),
+                        on_click=State.edit_task(task.id),
                         size="1",
                         variant="surface",
                         color_scheme="blue",
-                        class_name="font-medium transition-all duration-200 hover:scale-105 px-2"
+                        class_name="task-card-action font-medium px-2"
                     ),
                     rx.button(
                         rx.icon("trash", class_name="w-3.5 h-3.5"),
-                        on_click=lambda: State.delete_task(task.id),
+                        on_click=State.delete_task(task.id),
                         size="1",
                         variant="surface",
                         color_scheme="red",
-                        class_name="font-medium transition-all duration-200 hover:scale-105 px-2"
+                        class_name="task-card-action font-medium px-2"
                     ),
                     spacing="2",
                     align="center"
@@ -229,9 +171,36 @@ def task_item(task: Task) -> rx.Component:
             spacing="3",
             width="100%"
         ),
-        class_name=f"border-0 shadow-md hover:shadow-lg transition-all duration-300 transform hover:scale-[1.01] {priority_gradient}"
+        # Border, shadow and hover effects come from .task-card in assets/styles.css
+        class_name=f"task-card {task.priority_gradient}"
+    )
+
+def task_column(status: str, icon: str, title: rx.Var, count: rx.Var, color: str) -> rx.Component:
+    """Kanban column: a colored header card followed by the cards for one status."""
+    return rx.vstack(
+        rx.card(
+            rx.hstack(
+                rx.icon(icon, class_name=f"w-6 h-6 text-{color}-500"),
+                rx.vstack(
+                    rx.heading(title, size="5", weight="bold", class_name="text-gray-900 dark:text-gray-100"),
+                    rx.text(f"{count.to_string()} tasks", size="2", class_name=f"text-{color}-600 dark:text-{color}-400 font-medium"),
+                    spacing="1"
+                ),
+                spacing="3",
+                align="center"
+            ),
+            class_name=f"bg-gradient-to-r from-{color}-50 to-{color}-100 dark:from-{color}-900/20 dark:to-{color}-800/20 border-0 mb-4"
+        ),
+        rx.foreach(
+            State.tasks_by_status[status],
+            lambda task: task_item(task=task, key=task.id)
+        ),
+        spacing="3",
+        width="100%",
+        align_items="stretch"
     )
 
+@rx.memo
 def theme_toggle() -> rx.Component:
     """Theme toggle button component."""
     return rx.color_mode.button(
@@ -240,6 +209,7 @@ def theme_toggle() -> rx.Component:
         class_name="rounded-full p-2 hover:bg-gray-100 dark:hover:bg-gray-800 transition-colors"
     )
 
+@rx.memo
 def user_profile_section() -> rx.Component:
     """User profile section showing current user info and logout."""
     return rx.hstack(
@@ -261,6 +231,7 @@ def user_profile_section() -> rx.Component:
         align="center"
     )
 
+@rx.memo
 def auth_buttons() -> rx.Component:
     """Authentication buttons for login/register."""
     return rx.hstack(
@@ -280,6 +251,7 @@ def auth_buttons() -> rx.Component:
         spacing="2"
     )
 
+@rx.memo
 def language_selector() -> rx.Component:
     """Language selector component."""
     return rx.select.root(
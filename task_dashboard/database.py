@@ -1,21 +1,36 @@
 """Database configuration and models for task management."""
 
+import logging
 import os
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, Text
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from sqlalchemy import create_engine, event, Column, String, Integer, DateTime, Text, Index, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
 from sqlalchemy.orm import declarative_base, sessionmaker
 from datetime import datetime, timezone
+from typing import Optional
 from urllib.parse import quote_plus
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 def get_utc_now():
     """Get current UTC time."""
     return datetime.now(timezone.utc)
 
+# Task timestamps keep microseconds on MySQL as well (plain DATETIME rounds to
+# whole seconds), so writes within the same second still change the latest
+# updated_at that GET /tasks derives its ETag from
+TaskTimestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
 class UserModel(Base):
     """SQLAlchemy model for users."""
     __tablename__ = 'users'
@@ -38,53 +53,280 @@ class TaskModel(Base):
     status = Column(String(20), default='todo')
     priority = Column(String(10), default='medium')
     due_date = Column(String(10))
-    created_at = Column(DateTime, default=get_utc_now)
-    updated_at = Column(DateTime, default=get_utc_now, onupdate=get_utc_now)
+    created_at = Column(TaskTimestamp, default=get_utc_now)
+    updated_at = Column(TaskTimestamp, default=get_utc_now, onupdate=get_utc_now)
+    
+    __table_args__ = (
+        # Back the GET /tasks filters (user + optional status/priority) and due-date lookups
+        Index("ix_tasks_user_status_priority", "user_id", "status", "priority"),
+        Index("ix_tasks_user_due", "user_id", "due_date"),
+        Index("ix_tasks_user_updated", "user_id", "updated_at"),
+    )
+
+# SQLite FTS5 index over task titles/descriptions, kept in sync by triggers.
+# The trigram tokenizer (SQLite 3.34+) serves the same case-insensitive
+# substring matches as LIKE '%search%', including text without word breaks
+TASKS_FTS_TABLE = "tasks_fts"
+TASKS_FTS_TOKENIZER = "trigram"
+TASKS_FTS_DDL = (
+    f"""CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, description, content='tasks', content_rowid='id', tokenize='{TASKS_FTS_TOKENIZER}'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tasks_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+)
+# Removes an index built with another tokenizer before TASKS_FTS_DDL recreates it
+TASKS_FTS_DROP = (
+    "DROP TRIGGER IF EXISTS tasks_ai",
+    "DROP TRIGGER IF EXISTS tasks_ad",
+    "DROP TRIGGER IF EXISTS tasks_au",
+    "DROP TABLE IF EXISTS tasks_fts",
+)
+
+# Applied to every new SQLite connection: WAL lets readers run alongside the
+# writer and NORMAL sync skips the per-commit fsync that WAL makes unnecessary
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Connection event hook applying SQLITE_PRAGMAS."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+_fts_available = {}
+
+def has_task_fts(engine) -> bool:
+    """Check (once per engine) whether the tasks FTS index exists with the current tokenizer."""
+    if engine not in _fts_available:
+        available = False
+        if engine.dialect.name == 'sqlite':
+            with engine.connect() as conn:
+                sql = conn.execute(
+                    text("SELECT sql FROM sqlite_master WHERE name = :name"),
+                    {"name": TASKS_FTS_TABLE}
+                ).scalar()
+            available = sql is not None and f"tokenize='{TASKS_FTS_TOKENIZER}'" in sql
+        _fts_available[engine] = available
+    return _fts_available[engine]
+
+# Seconds a health probe waits for its connection before reporting the database down
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', '2'))
+
+@dataclass(frozen=True, slots=True)
+class DBConfig:
+    """Database connection settings."""
+    db_type: str = 'sqlite'
+    host: str = 'localhost'
+    port: str = '3306'
+    user: str = 'root'
+    password: str = ''
+    name: str = 'task_dashboard'
+    path: str = 'task_dashboard.db'
+    # One engine per process. The pool is sized for the threadpool that runs
+    # the API's sync handlers (40 threads by default), per uvicorn worker
+    pool_size: int = 20
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    # Seconds a SQLite writer waits on a locked database before raising "database is locked"
+    sqlite_timeout: float = 30
+    
+    @classmethod
+    def from_env(cls) -> "DBConfig":
+        """Build the settings from DB_* environment variables."""
+        return cls(
+            db_type=os.getenv('DB_TYPE', 'sqlite').lower().strip(),
+            host=os.getenv('DB_HOST', 'localhost').strip(),
+            port=os.getenv('DB_PORT', '3306').strip(),
+            user=os.getenv('DB_USER', 'root').strip(),
+            password=os.getenv('DB_PASSWORD', '').strip(),
+            name=os.getenv('DB_NAME', 'task_dashboard').strip(),
+            path=os.getenv('DB_PATH', 'task_dashboard.db').strip(),
+            pool_size=int(os.getenv('DB_POOL_SIZE', '20')),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', '10')),
+            pool_timeout=float(os.getenv('DB_POOL_TIMEOUT', '30')),
+            pool_recycle=int(os.getenv('DB_POOL_RECYCLE', '1800')),
+            sqlite_timeout=float(os.getenv('DB_SQLITE_TIMEOUT', '30')),
+        )
+    
+    @property
+    def connection_string(self) -> str:
+        """SQLAlchemy URL for the configured backend."""
+        if self.db_type == 'mysql':
+            # URL encode the password to handle special characters
+            return f"mysql+pymysql://{self.user}:{quote_plus(self.password)}@{self.host}:{self.port}/{self.name}"
+        # Default SQLite configuration
+        return f"sqlite:///{self.path}"
+
+@lru_cache(maxsize=1)
+def db_config() -> DBConfig:
+    """Database settings, read from the environment once per process."""
+    return DBConfig.from_env()
 
 class DatabaseManager:
-    """Database connection and session management."""
+    """Database connection and session management.
+    
+    Engines are created, and tables ensured, on first use rather than at
+    construction, so importing this module opens no connections and runs no DDL.
+    """
+    
+    def __init__(self, config: Optional[DBConfig] = None):
+        self.config = config
+        self._engine = None
+        self._health_engine = None
+        self._session_factory = None
+        self._setup_lock = threading.Lock()
+    
+    def _ensure_setup(self):
+        """Run setup_database once, on first use."""
+        if self._engine is None:
+            with self._setup_lock:
+                if self._engine is None:
+                    self.setup_database()
+    
+    @property
+    def engine(self):
+        """Engine for application queries."""
+        self._ensure_setup()
+        return self._engine
+    
+    @property
+    def health_engine(self):
+        """Single-connection engine reserved for health checks."""
+        self._ensure_setup()
+        return self._health_engine
     
-    def __init__(self):
-        self.engine = None
-        self.SessionLocal = None
-        self.setup_database()
+    @property
+    def SessionLocal(self):
+        """Session factory bound to `engine`."""
+        self._ensure_setup()
+        return self._session_factory
     
     def setup_database(self):
-        """Setup database connection based on environment."""
-        db_type = os.getenv('DB_TYPE', 'sqlite').lower().strip()
+        """Setup database connection from the configured settings."""
+        if self.config is None:
+            self.config = db_config()
+        config = self.config
+        connection_string = config.connection_string
         
-        if db_type == 'mysql':
-            # MySQL configuration
-            db_host = os.getenv('DB_HOST', 'localhost').strip()
-            db_port = os.getenv('DB_PORT', '3306').strip()
-            db_user = os.getenv('DB_USER', 'root').strip()
-            db_password = os.getenv('DB_PASSWORD', '').strip()
-            db_name = os.getenv('DB_NAME', 'task_dashboard').strip()
-            
-            # URL encode the password to handle special characters
-            encoded_password = quote_plus(db_password)
-            connection_string = f"mysql+pymysql://{db_user}:{encoded_password}@{db_host}:{db_port}/{db_name}"
-            print('use mysql')
+        pool_options = dict(
+            pool_size=config.pool_size,
+            max_overflow=config.max_overflow,
+            pool_timeout=config.pool_timeout,
+        )
+        if config.db_type == 'mysql':
+            # Recycle before MySQL's wait_timeout drops idle connections, and
+            # test connections on checkout so restarts don't surface as errors
+            pool_options.update(
+                pool_recycle=config.pool_recycle,
+                pool_pre_ping=True,
+            )
         else:
-            # Default SQLite configuration
-            db_path = os.getenv('DB_PATH', 'task_dashboard.db').strip()
-            connection_string = f"sqlite:///{db_path}"
-            print('use sqlite')
-        
-        self.engine = create_engine(connection_string, echo=False)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+            # Pooled connections are shared across the API threadpool; with WAL
+            # only writers contend, and they queue on the busy timeout
+            pool_options.update(
+                connect_args={"check_same_thread": False, "timeout": config.sqlite_timeout},
+            )
+        engine = create_engine(connection_string, echo=False, **pool_options)
+        logger.debug("using database backend: %s", engine.dialect.name)
+        # Health probes get their own single-connection pool so load balancer
+        # checks can never starve request handlers of connections
+        self._health_engine = create_engine(
+            connection_string,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=HEALTH_CHECK_TIMEOUT,
+            pool_recycle=pool_options.get('pool_recycle', -1),
+            connect_args={"connect_timeout": int(HEALTH_CHECK_TIMEOUT)} if config.db_type == 'mysql' else {"timeout": HEALTH_CHECK_TIMEOUT},
+        )
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, "connect", apply_sqlite_pragmas)
+        self._session_factory = sessionmaker(bind=engine)
         
         # Create tables
-        Base.metadata.create_all(bind=self.engine)
+        Base.metadata.create_all(bind=engine)
+        
+        # Published last: other threads skip setup once the engine is visible
+        self._engine = engine
+        if engine.dialect.name == 'sqlite':
+            self.setup_fts()
+    
+    def setup_fts(self):
+        """Create the SQLite full-text index for task search if it is missing or outdated."""
+        _fts_available.pop(self.engine, None)
+        if has_task_fts(self.engine):
+            return
+        try:
+            with self.engine.begin() as conn:
+                for statement in TASKS_FTS_DROP + TASKS_FTS_DDL:
+                    conn.execute(text(statement))
+        except OperationalError as e:
+            # SQLite built without FTS5 or the trigram tokenizer; search falls back to LIKE
+            logger.warning("Full-text search unavailable: %s", e)
+        _fts_available.pop(self.engine, None)
     
     def get_session(self):
         """Get database session."""
         return self.SessionLocal()
     
+    @contextmanager
+    def session_scope(self):
+        """Session for one unit of work: committed on success, rolled back on error, always closed."""
+        with self.get_session() as session:
+            try:
+                yield session
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+    
+    def warm_pool(self, connections: int):
+        """Open up to `connections` pooled connections before the first requests arrive."""
+        opened = []
+        try:
+            # Hold them all at once so the pool really creates distinct connections
+            for _ in range(min(connections, self.engine.pool.size())):
+                conn = self.engine.connect()
+                opened.append(conn)
+                conn.execute(text("SELECT 1"))
+        except SQLAlchemyError as e:
+            logger.warning("Connection pool warm-up stopped early: %s", e)
+        finally:
+            for conn in opened:
+                conn.close()
+    
+    def ping(self) -> bool:
+        """Run `SELECT 1` on the health-check pool; return whether it succeeded."""
+        try:
+            with self.health_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except SQLAlchemyError:
+            return False
+    
     def close(self):
         """Close database connection."""
-        if self.engine:
-            self.engine.dispose()
+        if self._engine:
+            self._engine.dispose()
+        if self._health_engine:
+            self._health_engine.dispose()
 
-# Global database manager instance
+# Global database manager instance; connects on first use
 db_manager = DatabaseManager()
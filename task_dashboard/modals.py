@@ -1,8 +1,62 @@
 """Modal dialogs for task dashboard application."""
 
+from functools import lru_cache
+
 import reflex as rx
 from task_dashboard.state import State
 
+# Class names shared by the dialogs below
+DIALOG_TITLE_CLASS = "text-2xl font-semibold bg-gradient-to-r from-blue-600 to-purple-600 bg-clip-text text-transparent mb-6 dark:from-blue-400 dark:to-purple-400"
+AUTH_DIALOG_CLASS = "bg-white dark:bg-gray-800 rounded-xl shadow-lg border-0 p-6 max-w-sm"
+LABEL_CLASS = "text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"
+INPUT_CLASS = "w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
+TEXTAREA_CLASS = INPUT_CLASS + " resize-none"
+QUICK_DATE_BUTTON_CLASS = "text-xs px-2 py-1 h-6"
+CANCEL_BUTTON_CLASS = "px-4 py-2 text-sm font-semibold text-gray-600 hover:text-gray-800 dark:text-gray-300 dark:hover:text-gray-100 hover:bg-gray-100 dark:hover:bg-gray-700 rounded-lg transition-all duration-200"
+PRIMARY_BUTTON_CLASS = "px-4 py-2 text-sm font-semibold text-white bg-gradient-to-r from-blue-600 to-purple-600 hover:from-blue-700 hover:to-purple-700 rounded-lg transition-all duration-200 shadow-md"
+LINK_BUTTON_CLASS = "text-blue-600 hover:text-blue-800 dark:text-blue-400 dark:hover:text-blue-300"
+AUTH_ERROR_CLASS = rx.cond(State.auth_error != "", "text-red-500 dark:text-red-400", "hidden")
+
+# Task dialog texts, switching between add and edit mode
+TASK_DIALOG_TITLE = rx.cond(State.is_editing, State.t_edit_task, State.t_add_task)
+TASK_SUBMIT_LABEL = rx.cond(State.is_editing, State.t_save, State.t_create_task)
+
+# Quick due-date buttons: (label, handler)
+QUICK_DATES = (
+    (State.t_today, State.set_due_date_today),
+    (State.t_tomorrow, State.set_due_date_tomorrow),
+    (State.t_next_week, State.set_due_date_next_week),
+)
+
+def _labeled_field(label, *fields) -> rx.Component:
+    """Form field(s) with a label above them."""
+    return rx.vstack(
+        rx.text(label, class_name=LABEL_CLASS),
+        *fields,
+        spacing="1",
+        align_items="start",
+        width="100%"
+    )
+
+def _labeled_input(label, **input_props) -> rx.Component:
+    """Labeled text input with the shared dialog input styling."""
+    return _labeled_field(label, rx.input(class_name=INPUT_CLASS, **input_props))
+
+@rx.memo
+def _auth_field(label: str, name: str, placeholder: str, input_type: str = "text") -> rx.Component:
+    """Required login/register input, memoized so each field re-renders on its own.
+    
+    As a memo component it must be called with keyword arguments.
+    """
+    return _labeled_input(label, type=input_type, placeholder=placeholder, name=name, required=True)
+
+# The dialogs only depend on State vars, never on arguments, so each builder is
+# cached and the page reuses one component tree instead of rebuilding it.
+# rx.memo compiles each dialog into its own React component, so state changes
+# that re-render the page do not re-render the dialogs unless their vars change.
+
+@lru_cache(maxsize=1)
+@rx.memo
 def add_task_modal() -> rx.Component:
     """Modern modal dialog for adding/editing tasks with refined design."""
     return rx.dialog.root(
@@ -10,90 +64,45 @@ def add_task_modal() -> rx.Component:
             rx.vstack(
                 # Modern header with gradient
                 rx.dialog.title(
-                    rx.cond(State.is_editing, State.t_edit_task, State.t_add_task),
-                    class_name="text-2xl font-semibold bg-gradient-to-r from-blue-600 to-purple-600 bg-clip-text text-transparent mb-6 dark:from-blue-400 dark:to-purple-400"
+                    TASK_DIALOG_TITLE,
+                    class_name=DIALOG_TITLE_CLASS
                 ),
                 
                 # Modern form container
                 rx.vstack(
                     # Title with compact styling
-                    rx.vstack(
-                        rx.text(State.t_title, 
-                               class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
-                        rx.input(
-                            placeholder=State.t_title,
-                            value=State.new_task_title,
-                            on_change=State.set_new_task_title,
-                            class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
-                        ),
-                        spacing="1",
-                        align_items="start"
+                    _labeled_input(
+                        State.t_title,
+                        placeholder=State.t_title,
+                        value=State.new_task_title,
+                        on_change=State.set_new_task_title
                     ),
                     
                     # Description with compact styling
-                    rx.vstack(
-                        rx.text(State.t_description, 
-                               class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
+                    _labeled_field(
+                        State.t_description,
                         rx.text_area(
                             placeholder=State.t_description,
                             value=State.new_task_description,
                             on_change=State.set_new_task_description,
                             rows="2",
-                            class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 resize-none placeholder-gray-400 dark:placeholder-gray-500"
-                        ),
-                        spacing="1",
-                        align_items="start"
+                            class_name=TEXTAREA_CLASS
+                        )
                     ),
                     
                     # Priority and Due Date with compact layout
                     rx.hstack(
-                        rx.vstack(
-                            rx.text(State.t_priority, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
+                        _labeled_field(
+                            State.t_priority,
                             rx.select(
-                                rx.cond(
-                                    State.current_language == "zh",
-                                    ["低", "中", "高"],
-                                    ["Low", "Medium", "High"]
-                                ),
-                                value=rx.cond(
-                                    State.current_language == "zh",
-                                    rx.match(
-                                        State.new_task_priority,
-                                        ("low", "低"),
-                                        ("medium", "中"),
-                                        ("high", "高"),
-                                        State.new_task_priority
-                                    ),
-                                    rx.match(
-                                        State.new_task_priority,
-                                        ("low", "Low"),
-                                        ("medium", "Medium"),
-                                        ("high", "High"),
-                                        State.new_task_priority
-                                    )
-                                ),
-                                on_change=lambda value: State.set_new_task_priority(
-                                    rx.match(
-                                        value,
-                                        ("低", "low"),
-                                        ("中", "medium"),
-                                        ("高", "high"),
-                                        ("Low", "low"),
-                                        ("Medium", "medium"),
-                                        ("High", "high"),
-                                        value
-                                    )
-                                ),
+                                State.priority_options,
+                                value=State.new_task_priority_label,
+                                on_change=State.select_new_task_priority,
                                 class_name="w-full bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg border-0 px-3 py-2 h-10 focus:outline-none focus:ring-1 focus:ring-blue-500 transition-all duration-200"
-                            ),
-                            spacing="1",
-                            width="100%",
-                            align_items="start"
+                            )
                         ),
-                        rx.vstack(
-                            rx.text(State.t_due_date, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
+                        _labeled_field(
+                            State.t_due_date,
                             rx.hstack(
                                 rx.input(
                                     type="date",
@@ -103,7 +112,7 @@ def add_task_modal() -> rx.Component:
                                 ),
                                 rx.button(
                                     State.t_clear,
-                                    on_click=lambda: State.set_new_task_due_date(""),
+                                    on_click=State.clear_due_date,
                                     variant="ghost",
                                     size="1",
                                     class_name="text-gray-500 hover:text-gray-700 dark:text-gray-400 dark:hover:text-gray-200 px-2 h-10 flex items-center text-sm"
@@ -113,33 +122,19 @@ def add_task_modal() -> rx.Component:
                             ),
                             # Quick selection buttons
                             rx.hstack(
-                                rx.button(
-                                    State.t_today,
-                                    on_click=State.set_due_date_today,
-                                    size="1",
-                                    variant="soft",
-                                    class_name="text-xs px-2 py-1 h-6"
-                                ),
-                                rx.button(
-                                    State.t_tomorrow,
-                                    on_click=State.set_due_date_tomorrow,
-                                    size="1",
-                                    variant="soft",
-                                    class_name="text-xs px-2 py-1 h-6"
-                                ),
-                                rx.button(
-                                    State.t_next_week,
-                                    on_click=State.set_due_date_next_week,
-                                    size="1",
-                                    variant="soft",
-                                    class_name="text-xs px-2 py-1 h-6"
-                                ),
+                                *[
+                                    rx.button(
+                                        label,
+                                        on_click=handler,
+                                        size="1",
+                                        variant="soft",
+                                        class_name=QUICK_DATE_BUTTON_CLASS
+                                    )
+                                    for label, handler in QUICK_DATES
+                                ],
                                 spacing="1",
                                 width="100%"
-                            ),
-                            spacing="1",
-                            width="100%",
-                            align_items="start"
+                            )
                         ),
                         spacing="3"
                     ),
@@ -165,19 +160,15 @@ def add_task_modal() -> rx.Component:
                         rx.button(
                             State.t_cancel,
                             variant="ghost",
-                            on_click=lambda: State.cancel_edit(),
-                            class_name="px-4 py-2 text-sm font-semibold text-gray-600 hover:text-gray-800 dark:text-gray-300 dark:hover:text-gray-100 hover:bg-gray-100 dark:hover:bg-gray-700 rounded-lg transition-all duration-200"
+                            on_click=State.cancel_edit,
+                            class_name=CANCEL_BUTTON_CLASS
                         )
                     ),
                     rx.dialog.close(
                         rx.button(
-                            rx.cond(State.is_editing, State.t_save, State.t_create_task),
-                            on_click=lambda: rx.cond(
-                                State.is_editing,
-                                State.update_task(),
-                                State.add_task()
-                            ),
-                            class_name="px-4 py-2 text-sm font-semibold text-white bg-gradient-to-r from-blue-600 to-purple-600 hover:from-blue-700 hover:to-purple-700 rounded-lg transition-all duration-200 shadow-md"
+                            TASK_SUBMIT_LABEL,
+                            on_click=State.save_task,
+                            class_name=PRIMARY_BUTTON_CLASS
                         )
                     ),
                     spacing="2",
@@ -193,55 +184,26 @@ def add_task_modal() -> rx.Component:
         open=State.show_add_modal
     )
 
-def login_modal() -> rx.Component:
-    """Login modal dialog."""
+def _auth_modal(title, fields, on_submit, is_open, switch_prompt, switch_label, on_switch) -> rx.Component:
+    """Dialog shared by login and register: title, form fields, error, actions and a link to the other dialog."""
     return rx.dialog.root(
         rx.dialog.content(
             rx.vstack(
                 rx.dialog.title(
-                    State.t_sign_in,
-                    class_name="text-2xl font-semibold bg-gradient-to-r from-blue-600 to-purple-600 bg-clip-text text-transparent mb-6 dark:from-blue-400 dark:to-purple-400"
+                    title,
+                    class_name=DIALOG_TITLE_CLASS
                 ),
                 
                 rx.form(
                     rx.vstack(
-                        rx.vstack(
-                            rx.text(State.t_username, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
-                            rx.input(
-                                placeholder=State.t_username,
-                                name="username",
-                                required=True,
-                                class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
-                            ),
-                            spacing="1",
-                            align_items="start",
-                            width="100%"
-                        ),
+                        *fields,
                         
-                        rx.vstack(
-                            rx.text(State.t_password, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
-                            rx.input(
-                                type="password",
-                                placeholder=State.t_password,
-                                name="password",
-                                required=True,
-                                class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
-                            ),
-                            spacing="1",
-                            align_items="start",
-                            width="100%"
-                        ),
-                        
-                        rx.cond(
-                            State.auth_error != "",
-                            rx.text(
-                                State.auth_error,
-                                color="red",
-                                font_size="sm",
-                                class_name="text-red-500 dark:text-red-400"
-                            )
+                        # Always mounted; only its visibility follows auth_error
+                        rx.text(
+                            State.auth_error,
+                            color="red",
+                            font_size="sm",
+                            class_name=AUTH_ERROR_CLASS
                         ),
                         
                         rx.hstack(
@@ -249,14 +211,14 @@ def login_modal() -> rx.Component:
                                 rx.button(
                                     State.t_cancel,
                                     variant="ghost",
-                                    class_name="px-4 py-2 text-sm font-semibold text-gray-600 hover:text-gray-800 dark:text-gray-300 dark:hover:text-gray-100 hover:bg-gray-100 dark:hover:bg-gray-700 rounded-lg transition-all duration-200"
+                                    class_name=CANCEL_BUTTON_CLASS
                                 )
                             ),
                             rx.dialog.close(
                                 rx.button(
-                                    State.t_sign_in,
+                                    title,
                                     type="submit",
-                                    class_name="px-4 py-2 text-sm font-semibold text-white bg-gradient-to-r from-blue-600 to-purple-600 hover:from-blue-700 hover:to-purple-700 rounded-lg transition-all duration-200 shadow-md"
+                                    class_name=PRIMARY_BUTTON_CLASS
                                 )
                             ),
                             spacing="2",
@@ -265,15 +227,12 @@ def login_modal() -> rx.Component:
                         ),
                         
                         rx.text(
-                            State.t_dont_have_account + " ",
+                            switch_prompt + " ",
                             rx.button(
-                                State.t_sign_up_here,
+                                switch_label,
                                 variant="ghost",
-                                on_click=lambda: [
-                                    State.toggle_login_modal(),
-                                    State.toggle_register_modal()
-                                ],
-                                class_name="text-blue-600 hover:text-blue-800 dark:text-blue-400 dark:hover:text-blue-300"
+                                on_click=on_switch,
+                                class_name=LINK_BUTTON_CLASS
                             ),
                             class_name="text-sm text-center text-gray-600 dark:text-gray-400"
                         ),
@@ -281,144 +240,78 @@ def login_modal() -> rx.Component:
                         spacing="4",
                         width="100%"
                     ),
-                    on_submit=State.login_user,
+                    on_submit=on_submit,
                     reset_on_submit=False,
                 ),
                 
                 spacing="4",
                 class_name="w-full max-w-sm"
             ),
-            class_name="bg-white dark:bg-gray-800 rounded-xl shadow-lg border-0 p-6 max-w-sm"
+            class_name=AUTH_DIALOG_CLASS
         ),
-        open=State.show_login_modal
+        open=is_open
+    )
+
+@lru_cache(maxsize=1)
+@rx.memo
+def login_modal() -> rx.Component:
+    """Login modal dialog."""
+    return _auth_modal(
+        State.t_sign_in,
+        [
+            _auth_field(
+                label=State.t_username,
+                name="username",
+                placeholder=State.t_username
+            ),
+            _auth_field(
+                label=State.t_password,
+                name="password",
+                placeholder=State.t_password,
+                input_type="password"
+            ),
+        ],
+        on_submit=State.login_user,
+        is_open=State.show_login_modal,
+        switch_prompt=State.t_dont_have_account,
+        switch_label=State.t_sign_up_here,
+        on_switch=State.switch_to_register,
     )
 
+@lru_cache(maxsize=1)
+@rx.memo
 def register_modal() -> rx.Component:
     """Registration modal dialog."""
-    return rx.dialog.root(
-        rx.dialog.content(
-            rx.vstack(
-                rx.dialog.title(
-                    State.t_create_account,
-                    class_name="text-2xl font-semibold bg-gradient-to-r from-blue-600 to-purple-600 bg-clip-text text-transparent mb-6 dark:from-blue-400 dark:to-purple-400"
-                ),
-                
-                rx.form(
-                    rx.vstack(
-                        rx.vstack(
-                            rx.text(State.t_username, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
-                            rx.input(
-                                placeholder=State.t_username,
-                                name="username",
-                                required=True,
-                                class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
-                            ),
-                            spacing="1",
-                            align_items="start",
-                            width="100%"
-                        ),
-                        
-                        rx.vstack(
-                            rx.text(State.t_email, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
-                            rx.input(
-                                type="email",
-                                placeholder=State.t_email,
-                                name="email",
-                                required=True,
-                                class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
-                            ),
-                            spacing="1",
-                            align_items="start",
-                            width="100%"
-                        ),
-                        
-                        rx.vstack(
-                            rx.text(State.t_password, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
-                            rx.input(
-                                type="password",
-                                placeholder=State.t_password + " (min 6 characters)",
-                                name="password",
-                                required=True,
-                                class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
-                            ),
-                            spacing="1",
-                            align_items="start",
-                            width="100%"
-                        ),
-                        
-                        rx.vstack(
-                            rx.text(State.t_confirm_password, 
-                                   class_name="text-sm font-medium text-gray-700 dark:text-gray-300 mb-1"),
-                            rx.input(
-                                type="password",
-                                placeholder=State.t_confirm_password,
-                                name="confirm_password",
-                                required=True,
-                                class_name="w-full px-3 py-2.5 border-0 bg-gray-50 dark:bg-gray-700 dark:text-white rounded-lg focus:outline-none focus:ring-1 focus:ring-blue-500 focus:bg-white dark:focus:bg-gray-600 transition-all duration-200 placeholder-gray-400 dark:placeholder-gray-500"
-                            ),
-                            spacing="1",
-                            align_items="start",
-                            width="100%"
-                        ),
-                        
-                        rx.cond(
-                            State.auth_error != "",
-                            rx.text(
-                                State.auth_error,
-                                color="red",
-                                font_size="sm",
-                                class_name="text-red-500 dark:text-red-400"
-                            )
-                        ),
-                        
-                        rx.hstack(
-                            rx.dialog.close(
-                                rx.button(
-                                    State.t_cancel,
-                                    variant="ghost",
-                                    class_name="px-4 py-2 text-sm font-semibold text-gray-600 hover:text-gray-800 dark:text-gray-300 dark:hover:text-gray-100 hover:bg-gray-100 dark:hover:bg-gray-700 rounded-lg transition-all duration-200"
-                                )
-                            ),
-                            rx.dialog.close(
-                                rx.button(
-                                    State.t_create_account,
-                                    type="submit",
-                                    class_name="px-4 py-2 text-sm font-semibold text-white bg-gradient-to-r from-blue-600 to-purple-600 hover:from-blue-700 hover:to-purple-700 rounded-lg transition-all duration-200 shadow-md"
-                                )
-                            ),
-                            spacing="2",
-                            justify="end",
-                            width="100%"
-                        ),
-                        
-                        rx.text(
-                            State.t_already_have_account + " ",
-                            rx.button(
-                                State.t_sign_in_here,
-                                variant="ghost",
-                                on_click=lambda: [
-                                    State.toggle_register_modal(),
-                                    State.toggle_login_modal()
-                                ],
-                                class_name="text-blue-600 hover:text-blue-800 dark:text-blue-400 dark:hover:text-blue-300"
-                            ),
-                            class_name="text-sm text-center text-gray-600 dark:text-gray-400"
-                        ),
-                        
-                        spacing="4",
-                        width="100%"
-                    ),
-                    on_submit=State.register_user,
-                    reset_on_submit=False,
-                ),
-                
-                spacing="4",
-                class_name="w-full max-w-sm"
+    return _auth_modal(
+        State.t_create_account,
+        [
+            _auth_field(
+                label=State.t_username,
+                name="username",
+                placeholder=State.t_username
             ),
-            class_name="bg-white dark:bg-gray-800 rounded-xl shadow-lg border-0 p-6 max-w-sm"
-        ),
-        open=State.show_register_modal
-    )
\ No newline at end of file
+            _auth_field(
+                label=State.t_email,
+                name="email",
+                placeholder=State.t_email,
+                input_type="email"
+            ),
+            _auth_field(
+                label=State.t_password,
+                name="password",
+                placeholder=State.t_password + " (min 6 characters)",
+                input_type="password"
+            ),
+            _auth_field(
+                label=State.t_confirm_password,
+                name="confirm_password",
+                placeholder=State.t_confirm_password,
+                input_type="password"
+            ),
+        ],
+        on_submit=State.register_user,
+        is_open=State.show_register_modal,
+        switch_prompt=State.t_already_have_account,
+        switch_label=State.t_sign_in_here,
+        on_switch=State.switch_to_login,
+    )
@@ -14,6 +14,16 @@ class Task(rx.Base):
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+class TaskView(Task):
+    """Task with its display values resolved on the server for the task cards."""
+    priority_label: str = ""
+    status_label: str = ""
+    priority_color: str = "gray"
+    status_icon: str = "circle"
+    status_color: str = "text-gray-500"
+    priority_gradient: str = "bg-gray-50 dark:bg-gray-800/50"
+    created_at_date: str = "Recent"
+
 class User(rx.Base):
     """User data model."""
     id: int
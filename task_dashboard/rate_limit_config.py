@@ -18,4 +18,37 @@ class RateLimitConfig:
     API_LIMIT = os.getenv("API_LIMIT", "1000/minute" if IS_TESTING else "100/minute")
     
     # Strict API rate limit for sensitive operations (requests per minute)
-    STRICT_API_LIMIT = os.getenv("STRICT_API_LIMIT", "100/minute" if IS_TESTING else "10/minute")
\ No newline at end of file
+    STRICT_API_LIMIT = os.getenv("STRICT_API_LIMIT", "100/minute" if IS_TESTING else "10/minute")
+    
+    # Window algorithm. "moving-window" counts hits over the trailing period, so
+    # clients cannot burst twice the limit across a fixed window boundary
+    STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "moving-window")
+    
+    # Shared limiter storage, e.g. redis://host:6379 so all workers count against
+    # the same limits (the default in-memory storage is per process)
+    STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    
+    # Take the client IP from X-Forwarded-For; only enable behind a trusted proxy
+    TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+    
+    # Reverse proxies in front of the app, each appending one X-Forwarded-For entry
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "1"))
+    
+    # Failed logins allowed per (client IP, username) before bcrypt is skipped
+    MAX_FAILED_LOGINS = int(os.getenv("MAX_FAILED_LOGINS", "100" if IS_TESTING else "10"))
+    
+    # Seconds a failed-login counter is kept after the last failure
+    FAILED_LOGIN_WINDOW = int(os.getenv("FAILED_LOGIN_WINDOW", "300"))
+
+def forwarded_client_ip(forwarded_for: str, peer_ip: str) -> str:
+    """Client IP behind RateLimitConfig.TRUSTED_PROXY_COUNT proxies, else peer_ip.
+    
+    Entries left of the ones our proxies appended are supplied by the client and
+    can be spoofed, so the address is counted from the right of X-Forwarded-For.
+    """
+    proxies = RateLimitConfig.TRUSTED_PROXY_COUNT
+    if RateLimitConfig.TRUST_PROXY_HEADERS and proxies > 0:
+        entries = [entry.strip() for entry in forwarded_for.split(",") if entry.strip()]
+        if len(entries) >= proxies:
+            return entries[-proxies]
+    return peer_ip
\ No newline at end of file
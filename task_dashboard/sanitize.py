@@ -0,0 +1,11 @@
+"""Input sanitization helpers."""
+
+import html
+
+def sanitize_text(value: str) -> str:
+    """Escape HTML markup in user-supplied plain text to prevent XSS.
+    
+    Existing entities are decoded first so that re-saving stored (already
+    escaped) text leaves it unchanged instead of escaping it again.
+    """
+    return html.escape(html.unescape(value), quote=False)
@@ -1,13 +1,49 @@
 """State management for task dashboard application."""
 
+import asyncio
 import reflex as rx
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
-import bleach
+from limits import parse, storage, strategies
+from sqlalchemy import select
 
-from task_dashboard.models import Task, User
+from task_dashboard.models import Task, TaskView, User
 from task_dashboard.database import db_manager, TaskModel
+from task_dashboard.rate_limit_config import RateLimitConfig, forwarded_client_ip
 from task_dashboard.translations import translation_manager
+from task_dashboard.sanitize import sanitize_text
+
+# Columns loaded for the task list; fetched as rows instead of ORM instances
+TASK_ROW_COLUMNS = (
+    TaskModel.id, TaskModel.title, TaskModel.description, TaskModel.status,
+    TaskModel.priority, TaskModel.due_date, TaskModel.created_at, TaskModel.updated_at,
+)
+
+# The dashboard's login/register forms get the same per-IP limits as the API's
+# /auth endpoints, so neither can be used to run bcrypt unthrottled. Counters are
+# only shared with the API (and other workers) when STORAGE_URI names a shared
+# backend such as redis; the default memory:// storage is per process
+_auth_limiter = strategies.STRATEGIES[RateLimitConfig.STRATEGY](
+    storage.storage_from_string(RateLimitConfig.STORAGE_URI)
+)
+_LOGIN_LIMIT = parse(RateLimitConfig.LOGIN_LIMIT)
+_REGISTER_LIMIT = parse(RateLimitConfig.REGISTER_LIMIT)
+
+# Card styling per priority/status, applied when building TaskView objects
+PRIORITY_COLORS = {"low": "blue", "medium": "yellow", "high": "red"}
+STATUS_ICONS = {"todo": "circle", "in_progress": "loader", "done": "circle-check"}
+STATUS_COLORS = {"todo": "text-orange-500", "in_progress": "text-yellow-500", "done": "text-green-500"}
+PRIORITY_GRADIENTS = {
+    "low": "bg-gradient-to-br from-blue-50 to-blue-100 dark:from-blue-900/20 dark:to-blue-800/20",
+    "medium": "bg-gradient-to-br from-yellow-50 to-yellow-100 dark:from-yellow-900/20 dark:to-yellow-800/20",
+    "high": "bg-gradient-to-br from-red-50 to-red-100 dark:from-red-900/20 dark:to-red-800/20",
+}
+
+# Toolbar select options: stored value -> translation key of its label
+STATUS_FILTER_OPTIONS = {"all": "all", "todo": "todo", "in_progress": "in_progress", "done": "done"}
+SORT_BY_OPTIONS = {"created_at": "created_at", "due_date": "due_date", "priority": "priority", "title": "title"}
+SORT_ORDER_OPTIONS = {"asc": "ascending", "desc": "descending"}
+PRIORITY_OPTIONS = {"low": "low", "medium": "medium", "high": "high"}
 
 def get_utc_now():
     """Get current UTC time."""
@@ -51,6 +87,7 @@ class State(rx.State):
     # Pagination
     items_per_page: int = 20
     page_number: int = 1  # Renamed to avoid conflict with navigation
+    _page_user_id: Optional[int] = None  # User whose tasks page_number refers to
     
     # UI State
     show_add_modal: bool = False
@@ -61,8 +98,8 @@ class State(rx.State):
     # Navigation
     current_page: str = "tasks"  # "tasks", "stats"
     
-    # Translation
-    current_language: str = "en"
+    # Translation, remembered in the browser across reloads
+    current_language: str = rx.LocalStorage("en", name="language", sync=True)
     
     @rx.var
     def t_app_title(self) -> str:
@@ -211,6 +248,11 @@ class State(rx.State):
         """Get no tasks found text in current language."""
         return translation_manager.get_translation(self.current_language, "no_tasks_found")
     
+    @rx.var
+    def t_show_more(self) -> str:
+        """Get show more text in current language."""
+        return translation_manager.get_translation(self.current_language, "show_more")
+    
     @rx.var
     def t_title(self) -> str:
         """Get title text in current language."""
@@ -491,6 +533,105 @@ class State(rx.State):
         """Get password too short text in current language."""
         return translation_manager.get_translation(self.current_language, "password_too_short")
     
+    @rx.var
+    def priority_labels(self) -> Dict[str, str]:
+        """Map each priority value to its label in the current language."""
+        return {
+            priority: translation_manager.get_translation(self.current_language, priority)
+            for priority in ("low", "medium", "high")
+        }
+    
+    @rx.var
+    def status_labels(self) -> Dict[str, str]:
+        """Map each status value to its label in the current language."""
+        return {
+            status: translation_manager.get_translation(self.current_language, status)
+            for status in ("todo", "in_progress", "done")
+        }
+    
+    def _option_labels(self, options: Dict[str, str]) -> Dict[str, str]:
+        """Map each select option value to its label in the current language."""
+        return {
+            value: translation_manager.get_translation(self.current_language, key)
+            for value, key in options.items()
+        }
+    
+    def _option_value(self, options: Dict[str, str], label: str) -> str:
+        """Map a select label in the current language back to its option value."""
+        for value, option_label in self._option_labels(options).items():
+            if option_label == label:
+                return value
+        return label
+    
+    @rx.var
+    def status_options(self) -> List[str]:
+        """Status filter options in the current language."""
+        return list(self._option_labels(STATUS_FILTER_OPTIONS).values())
+    
+    @rx.var
+    def sort_by_options(self) -> List[str]:
+        """Sort field options in the current language."""
+        return list(self._option_labels(SORT_BY_OPTIONS).values())
+    
+    @rx.var
+    def sort_order_options(self) -> List[str]:
+        """Sort order options in the current language."""
+        return list(self._option_labels(SORT_ORDER_OPTIONS).values())
+    
+    @rx.var
+    def priority_options(self) -> List[str]:
+        """Task priority options in the current language."""
+        return list(self._option_labels(PRIORITY_OPTIONS).values())
+    
+    @rx.var
+    def filter_status_label(self) -> str:
+        """Label of the selected status filter."""
+        return self._option_labels(STATUS_FILTER_OPTIONS).get(self.filter_status, self.filter_status)
+    
+    @rx.var
+    def sort_by_label(self) -> str:
+        """Label of the selected sort field."""
+        return self._option_labels(SORT_BY_OPTIONS).get(self.sort_by, self.sort_by)
+    
+    @rx.var
+    def sort_order_label(self) -> str:
+        """Label of the selected sort order."""
+        return self._option_labels(SORT_ORDER_OPTIONS).get(self.sort_order, self.sort_order)
+    
+    @rx.var
+    def new_task_priority_label(self) -> str:
+        """Label of the priority selected in the task form."""
+        return self._option_labels(PRIORITY_OPTIONS).get(self.new_task_priority, self.new_task_priority)
+    
+    @rx.event
+    def select_filter_status(self, label: str):
+        """Set the status filter from its label in the select."""
+        self.filter_status = self._option_value(STATUS_FILTER_OPTIONS, label)
+        self.page_number = 1
+    
+    @rx.event
+    def select_sort_by(self, label: str):
+        """Set the sort field from its label in the select."""
+        self.sort_by = self._option_value(SORT_BY_OPTIONS, label)
+        self.page_number = 1
+    
+    @rx.event
+    def select_sort_order(self, label: str):
+        """Set the sort order from its label in the select."""
+        self.sort_order = self._option_value(SORT_ORDER_OPTIONS, label)
+        self.page_number = 1
+    
+    @rx.event
+    def set_search_query(self, query: str):
+        """Set the search text, starting again from the first page of results."""
+        self.search_query = query
+        self.page_number = 1
+    
+    @rx.event
+    def select_new_task_priority(self, label: str):
+        """Set the task form's priority from its label in the select."""
+        self.new_task_priority = self._option_value(PRIORITY_OPTIONS, label)
+    
     @rx.event
     def set_language(self, language: str):
         """Set the current language."""
@@ -583,8 +724,12 @@ class State(rx.State):
         next_week = datetime.now() + timedelta(days=7)
         self.new_task_due_date = next_week.strftime("%Y-%m-%d")
     
-    def _db_task_to_task(self, db_task: TaskModel) -> Task:
-        """Convert database task to Task model."""
+    def clear_due_date(self):
+        """Clear the due date."""
+        self.new_task_due_date = ""
+    
+    def _db_task_to_task(self, db_task) -> Task:
+        """Convert a database task (ORM instance or TASK_ROW_COLUMNS row) to Task model."""
         return Task(
             id=str(db_task.id),
             title=db_task.title,
@@ -596,9 +741,20 @@ class State(rx.State):
             updated_at=db_task.updated_at.isoformat() if db_task.updated_at else ""
         )
     
+    def _client_ip(self) -> str:
+        """Client IP for rate limiting, using the API's trusted-proxy rule.
+        
+        Reflex's router.session.client_ip is the left-most X-Forwarded-For entry,
+        which the client controls, so the peer address is read from the raw headers.
+        """
+        headers = self.router.headers.raw_headers
+        return forwarded_client_ip(headers.get("x-forwarded-for", ""), headers.get("asgi-scope-client", ""))
+    
     # Authentication methods
+    # bcrypt hashing and verification take ~100ms of CPU each, so the auth
+    # handlers run AuthManager in a worker thread instead of on the event loop
     @rx.event
-    def register_user(self, form_data: dict):
+    async def register_user(self, form_data: dict):
         """Register a new user."""
         from task_dashboard.auth import AuthManager
         
@@ -618,8 +774,12 @@ class State(rx.State):
         if len(password) < 6:
             self.auth_error = "Password must be at least 6 characters"
             return
+        
+        if not _auth_limiter.hit(_REGISTER_LIMIT, "register", self._client_ip()):
+            self.auth_error = "Too many attempts. Please try again later."
+            return
             
-        user = AuthManager.create_user(username, email, password)
+        user = await asyncio.to_thread(AuthManager.create_user, username, email, password)
         if user:
             self.current_user = User(**user)
             self.is_authenticated = True
@@ -631,7 +791,7 @@ class State(rx.State):
             self.auth_error = "Username or email already exists"
     
     @rx.event
-    def login_user(self, form_data: dict):
+    async def login_user(self, form_data: dict):
         """Login existing user."""
         from task_dashboard.auth import AuthManager
         
@@ -641,8 +801,12 @@ class State(rx.State):
         if not username or not password:
             self.auth_error = "Username and password are required"
             return
+        
+        if not _auth_limiter.hit(_LOGIN_LIMIT, "login", self._client_ip()):
+            self.auth_error = "Too many attempts. Please try again later."
+            return
             
-        user = AuthManager.authenticate_user(username, password)
+        user = await asyncio.to_thread(AuthManager.authenticate_user, username, password)
         if user:
             self.current_user = User(**user)
             self.is_authenticated = True
@@ -668,12 +832,19 @@ class State(rx.State):
         if not self.is_authenticated or not self.current_user:
             self.tasks = []
             return
+        
+        if self._page_user_id != self.current_user.id:
+            self._page_user_id = self.current_user.id
+            self.page_number = 1
             
         try:
             with db_manager.get_session() as session:
-                db_tasks = session.query(TaskModel).filter(
-                    TaskModel.user_id == self.current_user.id
-                ).order_by(TaskModel.created_at.desc()).all()
+                # Plain rows: no ORM identity map or instance state per task
+                db_tasks = session.execute(
+                    select(*TASK_ROW_COLUMNS)
+                    .where(TaskModel.user_id == self.current_user.id)
+                    .order_by(TaskModel.created_at.desc())
+                ).all()
                 
                 self.tasks = [self._db_task_to_task(task) for task in db_tasks]
         except Exception as e:
@@ -691,11 +862,11 @@ class State(rx.State):
             return
             
         # Sanitize inputs to prevent XSS
-        title = bleach.clean(title)
-        description = bleach.clean(self.new_task_description.strip())
+        title = sanitize_text(title)
+        description = sanitize_text(self.new_task_description.strip())
             
         try:
-            with db_manager.get_session() as session:
+            with db_manager.session_scope() as session:
                 new_db_task = TaskModel(
                     user_id=self.current_user.id,
                     title=title,
@@ -706,23 +877,23 @@ class State(rx.State):
                 )
                 
                 session.add(new_db_task)
-                session.commit()
-                session.refresh(new_db_task)
-                
+                # Flush assigns the id and column defaults; no refresh SELECT needed
+                session.flush()
                 new_task = self._db_task_to_task(new_db_task)
-                self.tasks = [new_task] + self.tasks
-                
-                if not self.continuous_add:
-                    self.reset_form()
-                    self.show_add_modal = False
-                else:
-                    # Reset form fields but keep modal open
-                    self.new_task_title = ""
-                    self.new_task_description = ""
-                    self.new_task_priority = "medium"
-                    self.new_task_due_date = ""
-                
-                return rx.toast.success("Task added successfully!")
+            
+            self.tasks = [new_task] + self.tasks
+            
+            if not self.continuous_add:
+                self.reset_form()
+                self.show_add_modal = False
+            else:
+                # Reset form fields but keep modal open
+                self.new_task_title = ""
+                self.new_task_description = ""
+                self.new_task_priority = "medium"
+                self.new_task_due_date = ""
+            
+            return rx.toast.success("Task added successfully!")
                 
         except Exception as e:
             print(f"Error adding task: {e}")
@@ -739,11 +910,13 @@ class State(rx.State):
             return
             
         # Sanitize inputs to prevent XSS
-        title = bleach.clean(title)
-        description = bleach.clean(self.new_task_description.strip())
+        title = sanitize_text(title)
+        description = sanitize_text(self.new_task_description.strip())
             
         try:
-            with db_manager.get_session() as session:
+            due_date = self.new_task_due_date if self.new_task_due_date else None
+            updated_at = get_utc_now()
+            with db_manager.session_scope() as session:
                 db_task = session.query(TaskModel).filter(
                     TaskModel.id == int(self.editing_task.id),
                     TaskModel.user_id == self.current_user.id
@@ -753,32 +926,39 @@ class State(rx.State):
                     db_task.title = title
                     db_task.description = description
                     db_task.priority = self.new_task_priority
-                    db_task.due_date = self.new_task_due_date if self.new_task_due_date else None
-                    db_task.updated_at = get_utc_now()
-                    session.commit()
-                    
-                    # Update in-memory state
-                    for task in self.tasks:
-                        if task.id == self.editing_task.id:
-                            task.title = db_task.title
-                            task.description = db_task.description
-                            task.priority = db_task.priority
-                            task.due_date = db_task.due_date
-                            task.updated_at = db_task.updated_at.isoformat()
-                            break
-                    
-                    self.reset_form()
-                    self.is_editing = False
-                    self.editing_task = None
-                    self.show_add_modal = False
-                    return rx.toast.success("Task updated successfully!")
-                else:
-                    return rx.toast.error("Task not found")
+                    db_task.due_date = due_date
+                    db_task.updated_at = updated_at
+            
+            if not db_task:
+                return rx.toast.error("Task not found")
+            
+            # Update in-memory state
+            for task in self.tasks:
+                if task.id == self.editing_task.id:
+                    task.title = title
+                    task.description = description
+                    task.priority = self.new_task_priority
+                    task.due_date = due_date
+                    task.updated_at = updated_at.isoformat()
+                    break
+            
+            self.reset_form()
+            self.is_editing = False
+            self.editing_task = None
+            self.show_add_modal = False
+            return rx.toast.success("Task updated successfully!")
                     
         except Exception as e:
             print(f"Error updating task: {e}")
             return rx.toast.error("Failed to update task")
     
+    @rx.event
+    def save_task(self):
+        """Submit the task modal: update the task being edited, otherwise add a new one."""
+        if self.is_editing:
+            return self.update_task()
+        return self.add_task()
+    
     @rx.event
     def edit_task(self, task: Task):
         """Set task for editing."""
@@ -803,7 +983,7 @@ class State(rx.State):
             return rx.toast.error("Please login to delete tasks")
             
         try:
-            with db_manager.get_session() as session:
+            with db_manager.session_scope() as session:
                 db_task = session.query(TaskModel).filter(
                     TaskModel.id == int(task_id),
                     TaskModel.user_id == self.current_user.id
@@ -811,13 +991,13 @@ class State(rx.State):
                 
                 if db_task:
                     session.delete(db_task)
-                    session.commit()
-                    
-                    # Remove from in-memory state
-                    self.tasks = [task for task in self.tasks if task.id != task_id]
-                    return rx.toast.success("Task deleted successfully!")
-                else:
-                    return rx.toast.error("Task not found")
+            
+            if not db_task:
+                return rx.toast.error("Task not found")
+            
+            # Remove from in-memory state
+            self.tasks = [task for task in self.tasks if task.id != task_id]
+            return rx.toast.success("Task deleted successfully!")
                     
         except Exception as e:
             print(f"Error deleting task: {e}")
@@ -830,23 +1010,25 @@ class State(rx.State):
             return
             
         try:
-            with db_manager.get_session() as session:
+            updated_at = None
+            with db_manager.session_scope() as session:
                 db_task = session.query(TaskModel).filter(
                     TaskModel.id == int(task_id),
                     TaskModel.user_id == self.current_user.id
                 ).first()
                 
                 if db_task:
+                    updated_at = get_utc_now()
                     db_task.status = new_status
-                    db_task.updated_at = get_utc_now()
-                    session.commit()
-                    
-                    # Update in-memory state
-                    for task in self.tasks:
-                        if task.id == task_id:
-                            task.status = new_status
-                            task.updated_at = db_task.updated_at.isoformat()
-                            break
+                    db_task.updated_at = updated_at
+            
+            if updated_at:
+                # Update in-memory state
+                for task in self.tasks:
+                    if task.id == task_id:
+                        task.status = new_status
+                        task.updated_at = updated_at.isoformat()
+                        break
                             
         except Exception as e:
             print(f"Error updating task status: {e}")
@@ -902,6 +1084,18 @@ class State(rx.State):
         self.show_register_modal = not self.show_register_modal
         self.auth_error = ""
     
+    def switch_to_register(self):
+        """Close the login modal and open the register modal."""
+        self.show_login_modal = False
+        self.show_register_modal = True
+        self.auth_error = ""
+    
+    def switch_to_login(self):
+        """Close the register modal and open the login modal."""
+        self.show_register_modal = False
+        self.show_login_modal = True
+        self.auth_error = ""
+    
     @rx.event
     def on_load(self):
         """Load tasks when page loads."""
@@ -985,13 +1179,47 @@ class State(rx.State):
         return len([t for t in self.tasks if t.priority == "low"])
     
     @rx.var
-    def tasks_by_status(self) -> Dict[str, List[Task]]:
-        """Get tasks grouped by status for efficient rendering."""
-        return {
-            "todo": [task for task in self.filtered_tasks if task.status == "todo"],
-            "in_progress": [task for task in self.filtered_tasks if task.status == "in_progress"],
-            "done": [task for task in self.filtered_tasks if task.status == "done"]
-        }
+    def tasks_by_status(self) -> Dict[str, List[TaskView]]:
+        """Get tasks grouped by status for efficient rendering.
+        
+        Each column is capped at `items_per_page * page_number` cards so the
+        DOM size does not grow with the number of tasks; `show_more_tasks`
+        reveals the next page. Labels and styling are resolved here, once per
+        change, so the cards render them without any per-row branching.
+        """
+        limit = self.items_per_page * self.page_number
+        priority_labels = self.priority_labels
+        status_labels = self.status_labels
+        grouped = {"todo": [], "in_progress": [], "done": []}
+        for task in self.filtered_tasks:
+            column = grouped.get(task.status)
+            if column is not None and len(column) < limit:
+                column.append(TaskView(
+                    **task.dict(),
+                    priority_label=priority_labels.get(task.priority, task.priority),
+                    status_label=status_labels.get(task.status, task.status),
+                    priority_color=PRIORITY_COLORS.get(task.priority, "gray"),
+                    status_icon=STATUS_ICONS.get(task.status, "circle"),
+                    status_color=STATUS_COLORS.get(task.status, "text-gray-500"),
+                    priority_gradient=PRIORITY_GRADIENTS.get(task.priority, "bg-gray-50 dark:bg-gray-800/50"),
+                    created_at_date=(task.created_at or "")[:10] or "Recent",
+                ))
+        return grouped
+    
+    @rx.var
+    def has_more_tasks(self) -> bool:
+        """Whether any column has tasks beyond the rendered page."""
+        limit = self.items_per_page * self.page_number
+        counts = {"todo": 0, "in_progress": 0, "done": 0}
+        for task in self.filtered_tasks:
+            if task.status in counts:
+                counts[task.status] += 1
+        return max(counts.values()) > limit
+    
+    @rx.event
+    def show_more_tasks(self):
+        """Render the next page of cards in every column."""
+        self.page_number += 1
     
     def navigate_to_page(self, page: str):
         """Navigate to a specific page."""
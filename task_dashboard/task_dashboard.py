@@ -5,7 +5,7 @@ from rxconfig import config
 
 from task_dashboard.models import Task, User
 from task_dashboard.state import State
-from task_dashboard.components import task_item, theme_toggle, user_profile_section, auth_buttons, language_selector
+from task_dashboard.components import task_column, theme_toggle, user_profile_section, auth_buttons, language_selector
 from task_dashboard.modals import add_task_modal, login_modal, register_modal
 
 def index() -> rx.Component:
@@ -441,123 +441,26 @@ def index() -> rx.Component:
                                             class_name="border-gray-300 dark:border-gray-600 focus:border-blue-500 focus:ring-2 focus:ring-blue-200 transition-all duration-200 bg-white dark:bg-gray-700 dark:text-white"
                                         ),
                                         rx.select(
-                                            rx.cond(
-                                                State.current_language == "zh",
-                                                ["全部", "待办", "进行中", "已完成"],
-                                                ["All", "To Do", "In Progress", "Done"]
-                                            ),
+                                            State.status_options,
                                             placeholder=State.t_filter_by_status,
-                                            value=rx.cond(
-                                                State.current_language == "zh",
-                                                rx.match(
-                                                    State.filter_status,
-                                                    ("all", "全部"),
-                                                    ("todo", "待办"),
-                                                    ("in_progress", "进行中"),
-                                                    ("done", "已完成"),
-                                                    State.filter_status
-                                                ),
-                                                rx.match(
-                                                    State.filter_status,
-                                                    ("all", "All"),
-                                                    ("todo", "To Do"),
-                                                    ("in_progress", "In Progress"),
-                                                    ("done", "Done"),
-                                                    State.filter_status
-                                                )
-                                            ),
-                                            on_change=lambda value: State.set_filter_status(
-                                                rx.match(
-                                                    value,
-                                                    ("全部", "all"),
-                                                    ("待办", "todo"),
-                                                    ("进行中", "in_progress"),
-                                                    ("已完成", "done"),
-                                                    ("All", "all"),
-                                                    ("To Do", "todo"),
-                                                    ("In Progress", "in_progress"),
-                                                    ("Done", "done"),
-                                                    value
-                                                )
-                                            ),
+                                            value=State.filter_status_label,
+                                            on_change=State.select_filter_status,
                                             width="150px",
                                             class_name="border-gray-300 dark:border-gray-600 focus:border-blue-500 focus:ring-2 focus:ring-blue-200 transition-all duration-200 bg-white dark:bg-gray-700 dark:text-white"
                                         ),
                                         rx.select(
-                                            rx.cond(
-                                                State.current_language == "zh",
-                                                ["创建时间", "截止日期", "优先级", "标题"],
-                                                ["Created At", "Due Date", "Priority", "Title"]
-                                            ),
+                                            State.sort_by_options,
                                             placeholder=State.t_sort_by,
-                                            value=rx.cond(
-                                                State.current_language == "zh",
-                                                rx.match(
-                                                    State.sort_by,
-                                                    ("created_at", "创建时间"),
-                                                    ("due_date", "截止日期"),
-                                                    ("priority", "优先级"),
-                                                    ("title", "标题"),
-                                                    State.sort_by
-                                                ),
-                                                rx.match(
-                                                    State.sort_by,
-                                                    ("created_at", "Created At"),
-                                                    ("due_date", "Due Date"),
-                                                    ("priority", "Priority"),
-                                                    ("title", "Title"),
-                                                    State.sort_by
-                                                )
-                                            ),
-                                            on_change=lambda value: State.set_sort_by(
-                                                rx.match(
-                                                    value,
-                                                    ("创建时间", "created_at"),
-                                                    ("截止日期", "due_date"),
-                                                    ("优先级", "priority"),
-                                                    ("标题", "title"),
-                                                    ("Created At", "created_at"),
-                                                    ("Due Date", "due_date"),
-                                                    ("Priority", "priority"),
-                                                    ("Title", "title"),
-                                                    value
-                                                )
-                                            ),
+                                            value=State.sort_by_label,
+                                            on_change=State.select_sort_by,
                                             width="150px",
                                             class_name="border-gray-300 dark:border-gray-600 focus:border-blue-500 focus:ring-2 focus:ring-blue-200 transition-all duration-200 bg-white dark:bg-gray-700 dark:text-white"
                                         ),
                                         rx.select(
-                                            rx.cond(
-                                                State.current_language == "zh",
-                                                ["升序", "降序"],
-                                                ["Ascending", "Descending"]
-                                            ),
+                                            State.sort_order_options,
                                             placeholder=State.t_order,
-                                            value=rx.cond(
-                                                State.current_language == "zh",
-                                                rx.match(
-                                                    State.sort_order,
-                                                    ("asc", "升序"),
-                                                    ("desc", "降序"),
-                                                    State.sort_order
-                                                ),
-                                                rx.match(
-                                                    State.sort_order,
-                                                    ("asc", "Ascending"),
-                                                    ("desc", "Descending"),
-                                                    State.sort_order
-                                                )
-                                            ),
-                                            on_change=lambda value: State.set_sort_order(
-                                                rx.match(
-                                                    value,
-                                                    ("升序", "asc"),
-                                                    ("降序", "desc"),
-                                                    ("Ascending", "asc"),
-                                                    ("Descending", "desc"),
-                                                    value
-                                                )
-                                            ),
+                                            value=State.sort_order_label,
+                                            on_change=State.select_sort_order,
                                             width="100px",
                                             class_name="border-gray-300 dark:border-gray-600 focus:border-blue-500 focus:ring-2 focus:ring-blue-200 transition-all duration-200 bg-white dark:bg-gray-700 dark:text-white"
                                         ),
@@ -578,83 +481,26 @@ def index() -> rx.Component:
                             
                                 # Task columns with modern headers
                                 rx.grid(
-                                    # To Do Column
-                                    rx.vstack(
-                                        rx.card(
-                                            rx.hstack(
-                                                rx.icon("circle", class_name="w-6 h-6 text-orange-500"),
-                                                rx.vstack(
-                                                    rx.heading(State.t_todo, size="5", weight="bold", class_name="text-gray-900 dark:text-gray-100"),
-                                                    rx.text(f"{State.todo_count.to_string()} tasks", size="2", class_name="text-orange-600 dark:text-orange-400 font-medium"),
-                                                    spacing="1"
-                                                ),
-                                                spacing="3",
-                                                align="center"
-                                            ),
-                                            class_name="bg-gradient-to-r from-orange-50 to-orange-100 dark:from-orange-900/20 dark:to-orange-800/20 border-0 mb-4"
-                                        ),
-                                        rx.foreach(
-                                            State.tasks_by_status["todo"],
-                                            task_item
-                                        ),
-                                        spacing="3",
-                                        width="100%",
-                                        align_items="stretch"
-                                    ),
-                                    
-                                    # In Progress Column
-                                    rx.vstack(
-                                        rx.card(
-                                            rx.hstack(
-                                                rx.icon("loader", class_name="w-6 h-6 text-yellow-500"),
-                                                rx.vstack(
-                                                    rx.heading(State.t_in_progress, size="5", weight="bold", class_name="text-gray-900 dark:text-gray-100"),
-                                                    rx.text(f"{State.in_progress_count.to_string()} tasks", size="2", class_name="text-yellow-600 dark:text-yellow-400 font-medium"),
-                                                    spacing="1"
-                                                ),
-                                                spacing="3",
-                                                align="center"
-                                            ),
-                                            class_name="bg-gradient-to-r from-yellow-50 to-yellow-100 dark:from-yellow-900/20 dark:to-yellow-800/20 border-0 mb-4"
-                                        ),
-                                        rx.foreach(
-                                            State.tasks_by_status["in_progress"],
-                                            task_item
-                                        ),
-                                        spacing="3",
-                                        width="100%",
-                                        align_items="stretch"
-                                    ),
-                                    
-                                    # Done Column
-                                    rx.vstack(
-                                        rx.card(
-                                            rx.hstack(
-                                                rx.icon("circle-check", class_name="w-6 h-6 text-green-500"),
-                                                rx.vstack(
-                                                    rx.heading(State.t_done, size="5", weight="bold", class_name="text-gray-900 dark:text-gray-100"),
-                                                    rx.text(f"{State.done_count.to_string()} tasks", size="2", class_name="text-green-600 dark:text-green-400 font-medium"),
-                                                    spacing="1"
-                                                ),
-                                                spacing="3",
-                                                align="center"
-                                            ),
-                                            class_name="bg-gradient-to-r from-green-50 to-green-100 dark:from-green-900/20 dark:to-green-800/20 border-0 mb-4"
-                                        ),
-                                        rx.foreach(
-                                            State.tasks_by_status["done"],
-                                            task_item
-                                        ),
-                                        spacing="3",
-                                        width="100%",
-                                        align_items="stretch"
-                                    ),
+                                    task_column("todo", "circle", State.t_todo, State.todo_count, "orange"),
+                                    task_column("in_progress", "loader", State.t_in_progress, State.in_progress_count, "yellow"),
+                                    task_column("done", "circle-check", State.t_done, State.done_count, "green"),
                                     columns="3",
                                     spacing="6",
                                     width="100%",
                                     class_name="grid-cols-1 md:grid-cols-3 gap-6"
                                 ),
                                 
+                                rx.cond(
+                                    State.has_more_tasks,
+                                    rx.button(
+                                        State.t_show_more,
+                                        on_click=State.show_more_tasks,
+                                        variant="soft",
+                                        size="2",
+                                        class_name="self-center"
+                                    )
+                                ),
+                                
                                 rx.cond(
                                     State.filtered_tasks.length() == 0,
                                     rx.card(
@@ -689,7 +535,8 @@ app = rx.App(
         has_background=True,
         radius="large",
         scaling="100%",
-    )
+    ),
+    stylesheets=["/styles.css"],
 )
 app.add_page(index, title="Task Dashboard", on_load=State.on_load)
 
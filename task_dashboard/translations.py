@@ -73,6 +73,7 @@ class TranslationManager:
                 
                 # Messages
                 "no_tasks_found": "No tasks found",
+                "show_more": "Show more",
                 "please_login": "Please login to add tasks",
                 "task_added": "Task added successfully!",
                 "task_updated": "Task updated successfully!",
@@ -182,8 +183,13 @@ class TranslationManager:
                 "due_date": "截止日期",
                 "title": "标题",
                 
+                # Sorting
+                "ascending": "升序",
+                "descending": "降序",
+                
                 # Messages
                 "no_tasks_found": "未找到任务",
+                "show_more": "显示更多",
                 "please_login": "请先登录以添加任务",
                 "task_added": "任务添加成功！",
                 "task_updated": "任务更新成功！",
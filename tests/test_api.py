@@ -3,12 +3,16 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
 
-from task_dashboard.api import api_app
-from task_dashboard.database import db_manager, TaskModel, UserModel
+from task_dashboard.api import api_app, fts_match_query, _user_cache, _failed_logins, _task_list_cache
+from task_dashboard.database import (
+    db_manager, has_task_fts, DatabaseManager, DBConfig, TaskModel, UserModel,
+    TASKS_FTS_DDL, TASKS_FTS_DROP, _fts_available
+)
+from task_dashboard.rate_limit_config import RateLimitConfig
 
 # Test database setup
 TEST_DATABASE_URL = "sqlite:///./test_tasks.db"
@@ -36,6 +40,9 @@ def setup_test_db():
     """Set up test database before each test."""
     UserModel.metadata.create_all(bind=engine)
     TaskModel.metadata.create_all(bind=engine)
+    _user_cache.clear()
+    _failed_logins.clear()
+    _task_list_cache.clear()
     yield
     TaskModel.metadata.drop_all(bind=engine)
     UserModel.metadata.drop_all(bind=engine)
@@ -53,17 +60,17 @@ def auth_headers():
         "password": "testpass123"
     }
     
-    # Register user
-    response = client.post("/auth/register", json=user_data)
-    if response.status_code != 201:
-        # Try login if user exists
-        login_response = client.post("/auth/login", json={
-            "username": user_data["username"],
-            "password": "testpass123"
-        })
-        assert login_response.status_code == 200
-    
-    return {"Authorization": f"Bearer {user_data['username']}"}
+    # Register user (may already exist)
+    client.post("/auth/register", json=user_data)
+    
+    # Login to obtain an access token
+    login_response = client.post("/auth/login", json={
+        "username": user_data["username"],
+        "password": "testpass123"
+    })
+    assert login_response.status_code == 200
+    
+    return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
 
 @pytest.fixture
 def sample_task(auth_headers):
@@ -115,6 +122,73 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["database"] == "connected"
+    
+    def test_health_check_database_down(self, monkeypatch):
+        """Test that the health check reports an unreachable database."""
+        monkeypatch.setattr(db_manager, "ping", lambda: False)
+        response = client.get("/health")
+        assert response.status_code == 503
+        data = response.json()
+        assert data["status"] == "degraded"
+        assert data["database"] == "down"
+    
+    def test_health_endpoints_are_public(self):
+        """Test that only authenticated routes declare bearer security in the schema."""
+        paths = client.get("/openapi.json").json()["paths"]
+        assert "security" not in paths["/health"]["get"]
+        assert "security" not in paths["/"]["get"]
+        assert paths["/tasks"]["get"]["security"] == [{"HTTPBearer": []}]
+
+class TestAuthentication:
+    """Test token-based authentication."""
+    
+    def test_login_returns_access_token(self, auth_headers):
+        """Test that the issued token authenticates subsequent requests."""
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["username"].startswith("testuser_")
+    
+    def test_username_is_not_a_token(self, auth_headers):
+        """Test that a plain username is rejected as a bearer token."""
+        username = client.get("/auth/me", headers=auth_headers).json()["username"]
+        response = client.get("/tasks", headers={"Authorization": f"Bearer {username}"})
+        assert response.status_code == 401
+    
+    def test_missing_token(self):
+        """Test that requests without a bearer token are rejected."""
+        response = client.get("/tasks")
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Not authenticated"
+    
+    def test_invalid_token(self):
+        """Test that a malformed token is rejected."""
+        response = client.get("/tasks", headers={"Authorization": "Bearer not-a-token"})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid authentication credentials"
+    
+    def test_failed_logins_are_throttled(self, monkeypatch):
+        """Test that repeated failed logins are rejected before checking the password."""
+        monkeypatch.setattr(RateLimitConfig, "MAX_FAILED_LOGINS", 2)
+        credentials = {"username": "ghost_user", "password": "wrongpass"}
+        assert client.post("/auth/login", json=credentials).status_code == 401
+        assert client.post("/auth/login", json=credentials).status_code == 401
+        assert client.post("/auth/login", json=credentials).status_code == 429
+    
+    def test_spoofed_forwarded_for_is_ignored(self, monkeypatch):
+        """Test that client-supplied X-Forwarded-For entries do not reset the lockout."""
+        monkeypatch.setattr(RateLimitConfig, "TRUST_PROXY_HEADERS", True)
+        monkeypatch.setattr(RateLimitConfig, "MAX_FAILED_LOGINS", 2)
+        credentials = {"username": "ghost_user", "password": "wrongpass"}
+        # The proxy appends the real peer (203.0.113.7) after whatever the client sent
+        for i in range(2):
+            headers = {"X-Forwarded-For": f"10.0.0.{i}, 203.0.113.7"}
+            assert client.post("/auth/login", json=credentials, headers=headers).status_code == 401
+        headers = {"X-Forwarded-For": "10.0.0.99, 203.0.113.7"}
+        assert client.post("/auth/login", json=credentials, headers=headers).status_code == 429
+        
+        # A different real client is tracked separately
+        headers = {"X-Forwarded-For": "10.0.0.99, 198.51.100.4"}
+        assert client.post("/auth/login", json=credentials, headers=headers).status_code == 401
 
 class TestTaskCRUDOperations:
     """Test CRUD operations for tasks."""
@@ -232,8 +306,8 @@ class TestTaskCRUDOperations:
         """Test deleting a task."""
         task_id = sample_task["id"]
         response = client.delete(f"/tasks/{task_id}", headers=auth_headers)
-        assert response.status_code == 200
-        assert response.json()["message"] == "Task deleted successfully"
+        assert response.status_code == 204
+        assert response.content == b""
         
         # Verify task is deleted
         response = client.get(f"/tasks/{task_id}", headers=auth_headers)
@@ -245,6 +319,45 @@ class TestTaskCRUDOperations:
         assert response.status_code == 404
         assert response.json()["detail"] == "Task not found"
 
+    def test_create_without_returning_matches_get(self, auth_headers, monkeypatch):
+        """Test that the POST response matches the stored row on backends without RETURNING."""
+        monkeypatch.setattr(engine.dialect, "insert_returning", False)
+        created = client.post("/tasks", json={"title": "No returning"}, headers=auth_headers).json()
+        batch = client.post("/tasks:batch", json=[{"title": "Batch no returning"}], headers=auth_headers).json()
+        
+        for task in [created] + batch:
+            stored = client.get(f"/tasks/{task['id']}", headers=auth_headers).json()
+            assert task["created_at"] == stored["created_at"]
+            assert task["updated_at"] == stored["updated_at"]
+
+class TestTaskBatchCreate:
+    """Test bulk task creation endpoint."""
+    
+    def test_create_tasks_batch(self, auth_headers):
+        """Test creating several tasks in one request."""
+        tasks = [{"title": f"Batch Task {i}", "priority": "high"} for i in range(3)]
+        response = client.post("/tasks:batch", json=tasks, headers=auth_headers)
+        assert response.status_code == 201
+        data = response.json()
+        assert [task["title"] for task in data] == ["Batch Task 0", "Batch Task 1", "Batch Task 2"]
+        assert all(task["status"] == "todo" for task in data)
+        assert len({task["created_at"] for task in data}) == 1
+        
+        response = client.get("/tasks", headers=auth_headers)
+        assert len(response.json()) == 3
+    
+    def test_create_tasks_batch_is_atomic(self, auth_headers):
+        """Test that one invalid task rejects the whole batch."""
+        tasks = [{"title": "Valid Task"}, {"title": "   "}]
+        response = client.post("/tasks:batch", json=tasks, headers=auth_headers)
+        assert response.status_code == 400
+        assert client.get("/tasks", headers=auth_headers).json() == []
+    
+    def test_create_tasks_batch_empty(self, auth_headers):
+        """Test that an empty batch is rejected."""
+        response = client.post("/tasks:batch", json=[], headers=auth_headers)
+        assert response.status_code == 422
+
 class TestTaskStatusUpdate:
     """Test task status update endpoint."""
     
@@ -253,12 +366,8 @@ class TestTaskStatusUpdate:
         task_id = sample_task["id"]
         status_data = {"status": "done"}
         response = client.patch(f"/tasks/{task_id}/status", json=status_data, headers=auth_headers)
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["message"] == "Task status updated successfully"
-        assert data["task_id"] == task_id
-        assert data["new_status"] == "done"
+        assert response.status_code == 204
+        assert response.content == b""
         
         # Verify status was updated
         response = client.get(f"/tasks/{task_id}", headers=auth_headers)
@@ -269,6 +378,36 @@ class TestTaskStatusUpdate:
         status_data = {"status": "in_progress"}
         response = client.patch("/tasks/999/status", json=status_data, headers=auth_headers)
         assert response.status_code == 404
+    
+    def test_update_task_status_invalid(self, sample_task, auth_headers):
+        """Test that unknown status values are rejected."""
+        response = client.patch(f"/tasks/{sample_task['id']}/status", json={"status": "archived"}, headers=auth_headers)
+        assert response.status_code == 422
+    
+    def test_bulk_update_task_status(self, auth_headers):
+        """Test moving several tasks to a new status in one request."""
+        task_ids = []
+        for i in range(3):
+            response = client.post("/tasks", json={"title": f"Bulk Task {i}"}, headers=auth_headers)
+            task_ids.append(response.json()["id"])
+        
+        response = client.patch(
+            "/tasks/status",
+            json={"ids": task_ids[:2] + [999], "status": "done"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["updated"] == 2
+        
+        statuses = [client.get(f"/tasks/{task_id}", headers=auth_headers).json()["status"] for task_id in task_ids]
+        assert statuses == ["done", "done", "todo"]
+    
+    def test_bulk_update_task_status_invalid(self, auth_headers):
+        """Test bulk status update validation."""
+        response = client.patch("/tasks/status", json={"ids": [1], "status": "archived"}, headers=auth_headers)
+        assert response.status_code == 422
+        response = client.patch("/tasks/status", json={"ids": [], "status": "done"}, headers=auth_headers)
+        assert response.status_code == 422
 
 class TestTaskFiltering:
     """Test task filtering and search functionality."""
@@ -339,12 +478,175 @@ class TestTaskFiltering:
         assert len(data) == 1
         assert "regular" in data[0]["description"].lower()
     
+    def test_pagination_with_cursor(self, multiple_tasks, auth_headers):
+        """Test paging through tasks with limit and the X-Next-Cursor header."""
+        response = client.get("/tasks?limit=3", headers=auth_headers)
+        assert response.status_code == 200
+        first_page = response.json()
+        assert len(first_page) == 3
+        assert first_page[0]["title"] == "Regular Task"  # Newest first
+        cursor = response.headers["X-Next-Cursor"]
+        
+        response = client.get(f"/tasks?limit=3&cursor={cursor}", headers=auth_headers)
+        assert response.status_code == 200
+        second_page = response.json()
+        assert len(second_page) == 2
+        assert "X-Next-Cursor" not in response.headers
+        ids = [task["id"] for task in first_page + second_page]
+        assert sorted(ids, reverse=True) == ids
+        assert len(set(ids)) == 5
+    
+    def test_etag_not_modified(self, multiple_tasks, auth_headers):
+        """Test conditional GET /tasks with If-None-Match."""
+        response = client.get("/tasks", headers=auth_headers)
+        etag = response.headers["ETag"]
+        
+        response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        
+        # Different filters produce a different validator
+        response = client.get("/tasks?priority=high", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        
+        # Any change to the user's tasks invalidates it
+        client.patch(f"/tasks/{multiple_tasks[0]['id']}/status", json={"status": "done"}, headers=auth_headers)
+        response = client.get("/tasks", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+    
+    def test_cached_list_reflects_writes(self, multiple_tasks, auth_headers):
+        """Test that a cached task list is not served after the tasks change."""
+        task_id = multiple_tasks[0]['id']
+        first = client.get("/tasks", headers=auth_headers)
+        assert client.get("/tasks", headers=auth_headers).content == first.content
+        
+        client.patch(f"/tasks/{task_id}/status", json={"status": "done"}, headers=auth_headers)
+        tasks = client.get("/tasks", headers=auth_headers).json()
+        assert next(task for task in tasks if task["id"] == task_id)["status"] == "done"
+    
+    def test_write_drops_cached_list(self, auth_headers):
+        """Test that a write is visible even when the ETag source does not change."""
+        task_id = client.post("/tasks", json={"title": "Same second"}, headers=auth_headers).json()["id"]
+        assert client.get("/tasks", headers=auth_headers).json()[0]["status"] == "todo"
+        with engine.connect() as conn:
+            updated_at = conn.execute(text("SELECT updated_at FROM tasks WHERE id = :id"), {"id": task_id}).scalar()
+        
+        client.patch(f"/tasks/{task_id}/status", json={"status": "done"}, headers=auth_headers)
+        # Simulate a second-precision clock: same count, same latest updated_at
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE tasks SET updated_at = :updated_at WHERE id = :id"), {"updated_at": updated_at, "id": task_id})
+        assert client.get("/tasks", headers=auth_headers).json()[0]["status"] == "done"
+    
+    def test_large_list_is_gzipped(self, auth_headers):
+        """Test that large task lists are compressed."""
+        for i in range(10):
+            client.post("/tasks", json={"title": f"Task {i}", "description": "x" * 200}, headers=auth_headers)
+        
+        response = client.get("/tasks", headers={**auth_headers, "Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.json()) == 10
+    
+    def test_pagination_limit_bounds(self, auth_headers):
+        """Test that out-of-range page sizes are rejected."""
+        assert client.get("/tasks?limit=0", headers=auth_headers).status_code == 422
+        assert client.get("/tasks?limit=201", headers=auth_headers).status_code == 422
+    
+    def test_fts_match_query(self):
+        """Test building the full-text MATCH expression from a search term."""
+        assert fts_match_query("urgent work") == '"urgent work"'
+        assert fts_match_query('say "hi" now') == '"say ""hi"" now"'
+        assert fts_match_query("任务") is None  # Shorter than a trigram
+    
     def test_no_results_filtering(self, multiple_tasks, auth_headers):
         """Test filtering that returns no results."""
         response = client.get("/tasks?status=todo&priority=invalid_priority", headers=auth_headers)
         assert response.status_code == 200
         assert response.json() == []
 
+class TestTaskSearchFTS:
+    """Test task search through the SQLite full-text index."""
+    
+    @pytest.fixture(autouse=True)
+    def fts_index(self):
+        """Create the tasks FTS index on the test database."""
+        with engine.begin() as conn:
+            for statement in TASKS_FTS_DDL:
+                conn.execute(text(statement))
+        _fts_available.clear()
+        yield
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS tasks_fts"))
+        _fts_available.clear()
+    
+    def test_search_uses_fts_index(self, auth_headers):
+        """Test searching titles and descriptions with the FTS index present."""
+        client.post("/tasks", json={"title": "Urgent Work"}, headers=auth_headers)
+        client.post("/tasks", json={"title": "Groceries", "description": "urgent errands"}, headers=auth_headers)
+        client.post("/tasks", json={"title": "Read book"}, headers=auth_headers)
+        
+        response = client.get("/tasks?search=urgent", headers=auth_headers)
+        assert response.status_code == 200
+        assert sorted(task["title"] for task in response.json()) == ["Groceries", "Urgent Work"]
+        
+        # A different term reuses the cached statement with new bound values
+        response = client.get("/tasks?search=book", headers=auth_headers)
+        assert response.status_code == 200
+        assert [task["title"] for task in response.json()] == ["Read book"]
+    
+    def test_search_sees_updated_tasks(self, auth_headers):
+        """Test that the index follows task edits and deletes."""
+        task = client.post("/tasks", json={"title": "Draft report"}, headers=auth_headers).json()
+        client.put(f"/tasks/{task['id']}", json={"title": "Final summary"}, headers=auth_headers)
+        
+        assert client.get("/tasks?search=draft", headers=auth_headers).json() == []
+        assert len(client.get("/tasks?search=summary", headers=auth_headers).json()) == 1
+        
+        client.delete(f"/tasks/{task['id']}", headers=auth_headers)
+        assert client.get("/tasks?search=summary", headers=auth_headers).json() == []
+    
+    def test_search_matches_substrings(self, auth_headers):
+        """Test that FTS search keeps the substring semantics of LIKE."""
+        client.post("/tasks", json={"title": "Task backlog"}, headers=auth_headers)
+        client.post("/tasks", json={"title": "完成任务报告"}, headers=auth_headers)
+        client.post("/tasks", json={"title": "100% done_ish"}, headers=auth_headers)
+        
+        def titles(search):
+            response = client.get("/tasks", params={"search": search}, headers=auth_headers)
+            assert response.status_code == 200
+            return [task["title"] for task in response.json()]
+        
+        assert titles("ask") == ["Task backlog"]
+        assert titles("TASK BACK") == ["Task backlog"]
+        assert titles("任务报") == ["完成任务报告"]
+        assert titles("0% done_") == ["100% done_ish"]
+        # Too short for the trigram index; served by LIKE
+        assert titles("任务") == ["完成任务报告"]
+        assert titles("as") == ["Task backlog"]
+        assert titles('"') == []
+        assert titles('say "hi') == []
+    
+    def test_setup_replaces_outdated_index(self, tmp_path):
+        """Test that setup_fts rebuilds an index created with another tokenizer."""
+        manager = DatabaseManager(DBConfig(path=str(tmp_path / "fts.db")))
+        with manager.engine.begin() as conn:
+            for statement in TASKS_FTS_DROP:
+                conn.execute(text(statement))
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE tasks_fts USING fts5(title, description, "
+                "content='tasks', content_rowid='id', tokenize='porter unicode61')"
+            ))
+            conn.execute(text("INSERT INTO tasks (user_id, title) VALUES (1, 'Task backlog')"))
+        _fts_available.clear()
+        assert not has_task_fts(manager.engine)
+        
+        manager.setup_fts()
+        assert has_task_fts(manager.engine)
+        with manager.engine.connect() as conn:
+            rows = conn.execute(text("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH :query"), {"query": '"ask"'}).all()
+        assert len(rows) == 1
+        manager.close()
+
 class TestTaskValidation:
     """Test input validation for task operations."""
     
@@ -353,7 +655,7 @@ class TestTaskValidation:
         task_data = {"title": "Test", "priority": "invalid"}
         response = client.post("/tasks", json=task_data, headers=auth_headers)
         assert response.status_code == 422  # API now validates priority values
-        assert "Priority must be one of" in response.json()["detail"][0]["msg"]
+        assert response.json()["detail"][0]["msg"] == "Input should be 'low', 'medium' or 'high'"
     
     def test_invalid_date_format(self, auth_headers):
         """Test creating task with invalid date format."""
@@ -412,5 +714,32 @@ class TestTaskEdgeCases:
         assert response.status_code == 200
         assert len(response.json()) == 1
 
+    def test_like_wildcards_in_search(self, auth_headers):
+        """Test that % and _ in a search term match literally."""
+        client.post("/tasks", json={"title": "Reach 100% coverage"}, headers=auth_headers)
+        client.post("/tasks", json={"title": "Reach 1000 users"}, headers=auth_headers)
+        
+        response = client.get("/tasks?search=100%25", headers=auth_headers)
+        assert response.status_code == 200
+        assert [task["title"] for task in response.json()] == ["Reach 100% coverage"]
+    
+    def test_resaving_escaped_text_is_stable(self, auth_headers):
+        """Test that saving a task's stored text again does not re-escape it."""
+        response = client.post("/tasks", json={"title": "Tom & Jerry", "description": "<b>bold</b>"}, headers=auth_headers)
+        task = response.json()
+        assert task["title"] == "Tom &amp; Jerry"
+        assert task["description"] == "&lt;b&gt;bold&lt;/b&gt;"
+        
+        for _ in range(2):
+            stored = client.get(f"/tasks/{task['id']}", headers=auth_headers).json()
+            response = client.put(
+                f"/tasks/{task['id']}",
+                json={"title": stored["title"], "description": stored["description"]},
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            assert response.json()["title"] == "Tom &amp; Jerry"
+            assert response.json()["description"] == "&lt;b&gt;bold&lt;/b&gt;"
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -7,7 +7,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
 
-from task_dashboard.auth import AuthManager
+from task_dashboard.auth import AuthManager, _token_payloads
 from task_dashboard.database import db_manager, UserModel
 
 
@@ -57,6 +57,15 @@ def test_hash_uniqueness():
     # But they should be different due to different salts
     assert hash1 != hash2
 
+def test_token_cache_does_not_keep_raw_tokens():
+    """Test that decoded tokens are cached under a digest, not the token itself."""
+    token = AuthManager.create_access_token({'id': 42})
+    
+    assert AuthManager.decode_access_token(token) == 42
+    assert token not in _token_payloads
+    assert AuthManager.decode_access_token(token) == 42
+    assert AuthManager.decode_access_token(token + "x") is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file